@@ -0,0 +1,167 @@
+import math
+import re
+from collections import Counter
+
+from config import COUNTRY_LANGUAGES
+
+FACELESS_KEYWORDS = ["compilation", "animation", "gameplay", "tutorial", "music", "sound", "relax", "asmr", "lofi"]
+
+# Letras y dígitos (más marcas combinantes y el bloque devanagari, que \w parte en dos);
+# emojis, signos, "#" y "|" actúan como separadores
+TOKEN_PATTERN = re.compile(r"(?:[^\W_]|[\u0300-\u036f\u0900-\u097f])+")
+MIN_WORD_LEN = 3
+
+# Se quitan las tildes para agrupar "música"/"musica", pero no la ñ ("año" no es "ano")
+_FOLD = str.maketrans("áàâäãåéèêëíìîïóòôöõúùûüç", "aaaaaaeeeeiiiiooooouuuuc")
+
+
+def fold(word):
+    return word.casefold().translate(_FOLD)
+
+
+STOPWORDS = {
+    "es": """
+        a al algo ante antes aqui asi aun bien cada como con contra cual cuando de del desde donde
+        dos el ella ellas ellos en entre era es esa ese eso esta estas este esto estos fue ha hace
+        hasta hay la las le les lo los mas me mi mis muy nada ni no nos nuestro o otra otro para
+        pero poco por porque que quien se ser si sin sobre solo son su sus tambien te tiene todo
+        todos tu tus un una uno unos y ya yo vs
+    """,
+    "en": """
+        a about after all also an and any are as at be been before but by can did do does for
+        from get got has have he her his how i if in into is it its just me more most my new no
+        not now of on one only or our out over she so than that the their them then there these
+        they this to too up us was we were what when where which who why will with you your vs
+    """,
+    "pt": """
+        a ao aos as com como da das de do dos e ela ele eles em entre era essa esse esta este eu
+        foi ha isso ja mais mas me meu minha muito na nao nas no nos o os ou para pela pelo por
+        porque quando que se sem ser seu sua suas tambem te tem um uma voce
+    """,
+    "fr": """
+        a au aux avec ce ces comme dans de des du elle en est et il ils je la le les leur lui ma
+        mais me mes moi mon ne nous on ou par pas plus pour qu que qui sa se ses son sur ta te
+        toi ton tu un une vos votre vous
+    """,
+    "hi": """
+        aur hai hain ka ke ki ko kya me mein na ne par se ye yeh wo woh tha thi the bhi
+        और है हैं का के की को क्या में ने पर से ये यह वो था थी थे भी
+    """,
+    # Relleno habitual en títulos de YouTube, sea cual sea el idioma
+    "youtube": """
+        video videos official oficial shorts short full completo completa hd ft feat part parte
+        episode ep capitulo trailer live directo
+    """,
+}
+STOPWORDS = {lang: frozenset(fold(w) for w in words.split()) for lang, words in STOPWORDS.items()}
+ALL_STOPWORDS = frozenset().union(*STOPWORDS.values())
+
+
+def stopwords_for(region=None):
+    """Stopwords de los idiomas de la región (todas si no se indica) más el relleno de YouTube."""
+    if region is None:
+        return ALL_STOPWORDS
+    languages = COUNTRY_LANGUAGES.get(region, ("es", "en"))
+    return frozenset().union(STOPWORDS["youtube"], *(STOPWORDS[lang] for lang in languages))
+
+
+def segments(title):
+    """Tramos de tokens seguidos del título, como pares (clave normalizada, forma en minúsculas).
+
+    Un signo o un emoji entre dos palabras corta el tramo: las frases no lo cruzan.
+    """
+    tramos, current, end = [], [], 0
+    for m in TOKEN_PATTERN.finditer(title):
+        if current and title[end:m.start()].strip():
+            tramos.append(current)
+            current = []
+        current.append((fold(m.group()), m.group().lower()))
+        end = m.end()
+    if current:
+        tramos.append(current)
+    return tramos
+
+
+class KeywordCounts:
+    """Frecuencias de palabras, bigramas y trigramas de títulos; se actualizan y combinan por partes.
+
+    `counts` cuenta apariciones y `doc_freq` títulos que contienen cada término, así que
+    añadir una página o un snapshot nuevo (`add_titles`) o sumar otro recuento (`update`,
+    `+`) da lo mismo que recalcularlo todo. Un n-grama no puede empezar ni acabar en stopword.
+    """
+
+    def __init__(self, stopwords=ALL_STOPWORDS, max_n=3):
+        self.stopwords = stopwords
+        self.max_n = max_n
+        self.counts = Counter()
+        self.doc_freq = Counter()
+        self.docs = 0
+        self.surface = {}  # clave normalizada -> primera forma vista (con tildes)
+
+    @classmethod
+    def for_region(cls, region, max_n=3):
+        return cls(stopwords_for(region), max_n)
+
+    def _is_keyword(self, key):
+        return len(key) >= MIN_WORD_LEN and key not in self.stopwords and not key.isdigit()
+
+    def terms(self, title):
+        terms = []
+        for tokens in segments(title):
+            for key, surface in tokens:
+                self.surface.setdefault(key, surface)
+            keys = [key for key, _ in tokens]
+            edge = [self._is_keyword(k) for k in keys]
+            terms += [k for k, ok in zip(keys, edge) if ok]
+            for n in range(2, self.max_n + 1):
+                terms += [" ".join(keys[i:i + n]) for i in range(len(keys) - n + 1) if edge[i] and edge[i + n - 1]]
+        return terms
+
+    def add_titles(self, titles):
+        for title in titles:
+            terms = self.terms(title)
+            self.counts.update(terms)
+            self.doc_freq.update(set(terms))
+            self.docs += 1
+        return self
+
+    def update(self, other):
+        self.counts.update(other.counts)
+        self.doc_freq.update(other.doc_freq)
+        self.docs += other.docs
+        for key, surface in other.surface.items():
+            self.surface.setdefault(key, surface)
+        return self
+
+    def __add__(self, other):
+        merged = KeywordCounts(self.stopwords | other.stopwords, max(self.max_n, other.max_n))
+        return merged.update(self).update(other)
+
+    def display(self, term):
+        return " ".join(self.surface.get(key, key) for key in term.split(" "))
+
+    def most_common(self, n=None, sizes=(1,)):
+        """[(término, apariciones)] de los n-gramas de tamaño `sizes`, con las tildes originales."""
+        top = (item for item in self.counts.most_common() if item[0].count(" ") + 1 in sizes)
+        return [(self.display(term), count) for term, count in top][:n]
+
+    def rising(self, baseline, n=20, sizes=(1, 2, 3), min_docs=2):
+        """Términos en alza frente a `baseline`, puntuados al estilo TF-IDF.
+
+        TF es la fracción de títulos actuales con el término, y se pondera por el log del
+        cociente con su fracción (suavizada) en la referencia: lo frecuente ahora y raro
+        antes puntúa más, y lo que ya era igual de frecuente queda fuera.
+        Devuelve [(término, títulos ahora, títulos en la referencia, puntuación)].
+        """
+        if not self.docs:
+            return []
+        scored = []
+        for term, docs in self.doc_freq.items():
+            if docs < min_docs or term.count(" ") + 1 not in sizes:
+                continue
+            base = baseline.doc_freq.get(term, 0)
+            tf = docs / self.docs
+            score = tf * math.log(tf / ((base + 1) / (baseline.docs + 2)))
+            if score > 0:
+                scored.append((self.display(term), docs, base, round(score, 4)))
+        return sorted(scored, key=lambda row: row[3], reverse=True)[:n]
@@ -0,0 +1,108 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.environ.get("YT_CACHE_PATH", os.path.join(".cache", "youtube_api.sqlite"))
+
+# TTL (segundos) por endpoint; "videos:chart" es la lista mostPopular
+ENDPOINT_TTLS = {
+    "videoCategories": 3 * 24 * 3600,
+    "videos:chart": 15 * 60,
+    "videos": 3600,
+    "search": 3600,
+    "channels": 6 * 3600,
+    # Corto: la primera página de la lista de subidas marca hasta dónde rastrear un canal
+    "playlistItems": 5 * 60,
+}
+DEFAULT_TTL = 3600
+
+# Parámetros que nunca forman parte de la clave
+_EXCLUDED_PARAMS = {"key"}
+
+
+def ttl_for(endpoint, params):
+    if endpoint == "videos" and params.get("chart"):
+        return ENDPOINT_TTLS["videos:chart"]
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+def make_key(endpoint, params, base_url=None):
+    """Clave normalizada: endpoint + parámetros ordenados, sin la API key.
+
+    Con `base_url`, la clave incluye el servidor: las respuestas de un servidor simulado
+    nunca se sirven como reales.
+    """
+    items = sorted((k, str(v)) for k, v in params.items() if k not in _EXCLUDED_PARAMS and v is not None)
+    key = endpoint + "?" + "&".join(f"{k}={v}" for k, v in items)
+    return f"{base_url}/{key}" if base_url else key
+
+
+class ResponseCache:
+    """Caché en disco (SQLite) de respuestas JSON con TTL y expulsión LRU por tamaño.
+
+    Sobrevive a reinicios del proceso y se comparte entre sesiones de Streamlit.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
@@ -0,0 +1,249 @@
+"""Benchmark de los flujos de la app contra el servidor simulado, sin gastar cuota.
+
+Cada flujo (Tendencias, Buscar, Explorar Canal, Nicho, Ideas de Nicho y Subir Vídeo) se ejecuta con
+el AppTest de Streamlit, como si un usuario pulsara el botón, a varios tamaños: el
+servidor simulado (bench/mock_api.py, en un subproceso para no contaminar la memoria
+medida) devuelve ese número de vídeos por respuesta, saltándose los límites de los
+sliders y de la API; en Explorar Canal es el número de subidas del canal. Para Subir Vídeo, el tamaño/10 son MiB subidos por la cola a un
+GCS simulado.
+
+Por flujo y tamaño se mide: tiempo en frío (cachés vacías), peticiones al servidor,
+tiempo en caliente (segunda ejecución con la caché de respuestas llena) y pico de
+memoria (tracemalloc, en una pasada aparte). Con --baseline se comparan los
+resultados con un --json anterior y se sale con código 1 si algo empeora más de
+--tolerance.
+
+    python bench/bench_flows.py --sizes 20 200 2000 --latency 0.02 --json bench.json
+    python bench/bench_flows.py --baseline bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+FLOWS = ["trending", "search", "channel", "niche", "ideas", "upload"]
+SIZES = [20, 200, 2000]
+METRICS = ("cold_s", "requests", "peak_mb")
+
+
+class MockServer:
+    """bench/mock_api.py en un subproceso, configurado por HTTP entre ejecuciones."""
+
+    def __init__(self, fixtures=None):
+        cmd = [sys.executable, os.path.join(BENCH_DIR, "mock_api.py"), "serve", "--port", "0"]
+        if fixtures:
+            cmd += ["--fixtures", fixtures]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        port = int(self.proc.stdout.readline().split()[1])
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def configure(self, **config):
+        req = urllib.request.Request(f"{self.base_url}/__config", data=json.dumps(config).encode(), method="POST")
+        urllib.request.urlopen(req).read()
+
+    def stats(self):
+        return json.loads(urllib.request.urlopen(f"{self.base_url}/__stats").read())
+
+    def close(self):
+        self.proc.terminate()
+        self.proc.wait()
+
+
+def _app(tab):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+    at.secrets["YOUTUBE_API_KEY"] = "bench"
+    at.session_state["active_tab"] = tab
+    at.run()
+    return at
+
+
+def _click(at, label):
+    next(b for b in at.button if b.label.startswith(label)).click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return sum(len(df.value) for df in at.main.dataframe)
+
+
+def flow_trending(size):
+    return _click(_app("Tendencias"), "Obtener tendencias")
+
+
+def flow_search(size):
+    at = _app("Buscar")
+    at.text_input[0].input("lofi")
+    return _click(at, "Buscar")
+
+
+def flow_channel(size):
+    at = _app("Explorar Canal")
+    at.text_input[0].input("@canal0").run()
+    return _click(at, "Actualizar")
+
+
+def flow_niche(size):
+    at = _app("Nicho")
+    at.text_input[0].input("lofi")
+    return _click(at, "Buscar nichos")
+
+
+def flow_ideas(size):
+    return _click(_app("Ideas de Nicho"), "Generar ideas")
+
+
+_gcs = {}
+
+
+def flow_upload(size):
+    """Pestaña Subir Vídeo (canales del stand-in de Cloud Run) + un trabajo de la cola hasta terminar."""
+    from bench_upload import make_gcs_server
+    from services import get_upload_jobs
+    from upload_jobs import ACTIVE_STATES, DONE, UploadJobManager
+
+    at = _app("Subir Vídeo")
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    get_upload_jobs()  # la cola de la app arranca (y recupera trabajos) como en la pestaña real
+    if "server" not in _gcs:
+        _gcs["server"], _gcs["state"] = make_gcs_server()
+    manager = UploadJobManager(f"http://127.0.0.1:{_gcs['server'].server_port}", tempfile.mkdtemp())
+    block = os.urandom(1024 * 1024)
+    with tempfile.TemporaryFile() as f:
+        for _ in range(max(1, size // 10)):
+            f.write(block)
+        job_id = manager.submit("canal0", f, {"title": "bench"})
+    while (job := manager.get([job_id])[0])["status"] in ACTIVE_STATES:
+        time.sleep(0.05)
+    if job["status"] != DONE:
+        raise RuntimeError(job["message"])
+    return 1
+
+
+def _reset_caches():
+    import streamlit as st
+
+    from api_cache import DEFAULT_CACHE_PATH, ResponseCache
+    from channel_crawl import CHANNEL_CACHE_DIR
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    ResponseCache(DEFAULT_CACHE_PATH).clear()
+    shutil.rmtree(CHANNEL_CACHE_DIR, ignore_errors=True)
+
+
+def _requests(mock):
+    gcs = _gcs.get("state", {}).get("requests", 0)
+    return mock.stats()["requests"] + gcs
+
+
+def run_flow(mock, name, size, config, memory=True):
+    flow = globals()[f"flow_{name}"]
+    mock.configure(videos=size, page_size=size, uploads=size, **config)
+    _reset_caches()
+    before = _requests(mock)
+    t0 = time.perf_counter()
+    rows = flow(size)
+    result = {"flow": name, "size": size, "rows": rows, "cold_s": round(time.perf_counter() - t0, 3)}
+    result["requests"] = _requests(mock) - before
+
+    # Segunda ejecución sin vaciar cachés: la caché de respuestas debería evitar casi todo
+    t0 = time.perf_counter()
+    flow(size)
+    result["warm_s"] = round(time.perf_counter() - t0, 3)
+
+    if memory:
+        mock.configure(videos=size, page_size=size, uploads=size, **config)
+        _reset_caches()
+        tracemalloc.start()
+        flow(size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1e6, 1)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Filas que empeoran más de `tolerance` (fracción) respecto a la referencia."""
+    old = {(r["flow"], r["size"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        ref = old.get((r["flow"], r["size"]))
+        for metric in METRICS:
+            if ref and metric in r and ref.get(metric) and r[metric] > ref[metric] * (1 + tolerance):
+                regressions.append(f"{r['flow']}@{r['size']}: {metric} {ref[metric]} -> {r[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=FLOWS)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos por petición al servidor simulado")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracción de peticiones que fallan (503/403)")
+    parser.add_argument("--fixtures", help="respuestas grabadas con `mock_api.py record`")
+    parser.add_argument("--no-memory", action="store_true", help="omite la pasada con tracemalloc")
+    parser.add_argument("--json", help="guarda los resultados en este fichero")
+    parser.add_argument("--baseline", help="resultados anteriores (--json) con los que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    mock = MockServer(args.fixtures)
+    work_dir = tempfile.mkdtemp(prefix="bench_flows_")
+    # Antes de importar nada de la app: todo apunta al servidor simulado y a directorios temporales
+    os.environ.update({
+        "YOUTUBE_API_BASE_URL": mock.base_url,
+        "CLOUD_RUN_URL": mock.base_url,
+        "YT_CACHE_PATH": os.path.join(work_dir, "youtube_api.sqlite"),
+        "UPLOAD_JOBS_DIR": os.path.join(work_dir, "upload_jobs"),
+        "CHANNEL_CACHE_DIR": os.path.join(work_dir, "channels"),
+        # Sin precarga en segundo plano: contaría peticiones ajenas al flujo medido
+        "PREFETCH_INTERVAL": "0",
+    })
+    os.environ.pop("METRICS_PORT", None)
+    os.environ.pop("TELEMETRY_LOG", None)
+    # Fuera de `streamlit run`, AppTest y cache.clear() avisan en cada ejecución de que no hay runtime
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, ROOT)
+    config = {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate}
+
+    try:
+        run_flow(mock, "trending", 20, config, memory=False)  # calentamiento: imports de la app
+        results = []
+        print(f"{'flujo':10s} {'tamaño':>6s} {'filas':>6s} {'frío (s)':>9s} {'peticiones':>10s} "
+              f"{'caliente (s)':>12s} {'pico (MB)':>9s}")
+        for name in args.flows:
+            for size in args.sizes:
+                r = run_flow(mock, name, size, config, memory=not args.no_memory)
+                results.append(r)
+                print(f"{name:10s} {size:6d} {r['rows']:6d} {r['cold_s']:9.3f} {r['requests']:10d} "
+                      f"{r['warm_s']:12.3f} {r.get('peak_mb', float('nan')):9.1f}")
+    finally:
+        mock.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark del escaneo de Nicho contra un servidor local con latencia inyectada.
+
+Compara el flujo antiguo (páginas y canales de uno en uno) con `fetch_niche`.
+
+    python bench/bench_niche.py --videos 200 --latency 0.15
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_api import make_server  # noqa: E402
+from niche_pipeline import DEFAULT_CONCURRENCY, iter_niche  # noqa: E402
+from youtube_api import YouTubeClient  # noqa: E402
+
+
+def sequential_scan(yt, max_results):
+    """Réplica del bucle original: paginación y un channels.list por canal, en serie."""
+    videos, next_page = [], None
+    while len(videos) < max_results:
+        res = yt.get("search", part="snippet", q="bench", maxResults=50, pageToken=next_page)
+        videos.extend(res.get("items", []))
+        next_page = res.get("nextPageToken")
+        if not next_page:
+            break
+    channels = {}
+    for item in videos:
+        ch_id = item["snippet"]["channelId"]
+        if ch_id not in channels:
+            channels[ch_id] = yt.get("channels", part="snippet,statistics", id=ch_id)
+    return videos, channels
+
+
+def fetch_niche(yt, max_results, concurrency=DEFAULT_CONCURRENCY, **search_params):
+    """El escaneo actual (`iter_niche`) completo en memoria: devuelve (vídeos, {channel_id: item})."""
+    videos, channels = [], {}
+    for kind, payload in iter_niche(yt, max_results, concurrency, **search_params):
+        if kind == "videos":
+            videos.extend(payload)
+        else:
+            channels.update(payload)
+    return videos, channels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.15, help="segundos por petición")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server, counter = make_server(args.videos, args.latency)
+    yt = YouTubeClient("bench", base_url=f"http://127.0.0.1:{server.server_port}")
+
+    for name, scan in [
+        ("secuencial", lambda: sequential_scan(yt, args.videos)),
+        ("fetch_niche", lambda: fetch_niche(yt, args.videos, concurrency=args.concurrency, part="snippet", q="bench")),
+    ]:
+        counter["requests"] = 0
+        t0 = time.perf_counter()
+        videos, channels = scan()
+        elapsed = time.perf_counter() - t0
+        print(f"{name:12s} {elapsed:7.2f} s  {counter['requests']:4d} peticiones  "
+              f"{len(videos)} vídeos / {len(channels)} canales")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
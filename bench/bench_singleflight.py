@@ -0,0 +1,60 @@
+"""Prueba de carga del single-flight: N sesiones simuladas piden lo mismo a la vez.
+
+Cada sesión es un hilo que pide el chart mostPopular y las categorías de una
+región, como al pulsar "Obtener tendencias". Sin caché en disco, para medir solo
+el efecto de agrupar peticiones en vuelo. Las peticiones al servidor deberían
+mantenerse constantes aunque crezca el número de sesiones.
+
+    python bench/bench_singleflight.py --sessions 1 10 50 --latency 0.3
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import singleflight  # noqa: E402
+from mock_api import make_server  # noqa: E402
+from youtube_api import YouTubeClient  # noqa: E402
+
+
+def simulate(yt, sessions):
+    barrier = threading.Barrier(sessions)
+
+    def session():
+        barrier.wait()
+        yt.get("videoCategories", part="snippet", regionCode="MX")
+        yt.get("videos", part="snippet,statistics", chart="mostPopular", regionCode="MX", maxResults=50)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    server, counter = make_server(50, args.latency)
+    yt = YouTubeClient("bench", base_url=f"http://127.0.0.1:{server.server_port}")
+    for n in args.sessions:
+        counter["requests"] = 0
+        before = singleflight.stats()
+        t0 = time.perf_counter()
+        simulate(yt, n)
+        elapsed = time.perf_counter() - t0
+        after = singleflight.stats()
+        print(f"{n:4d} sesiones  {counter['requests']:4d} peticiones al servidor  "
+              f"{after['coalesced'] - before['coalesced']:4d} agrupadas  {elapsed:6.2f} s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
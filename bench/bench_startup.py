@@ -0,0 +1,74 @@
+"""Benchmark de arranque: tiempo de import de cada módulo y time-to-first-render.
+
+Cada import se mide en un proceso nuevo (arranque en frío, como un contenedor
+recién escalado). El primer render se mide con el AppTest de Streamlit contra
+el servidor simulado de mock_api, para no gastar cuota.
+
+    python bench/bench_startup.py
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "streamlit", "pandas", "pytrends.request",
+    "youtube_api", "views", "views.trending", "views.niche", "views.popularity",
+]
+
+
+def cold_import_time(module):
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def first_render_times():
+    from streamlit.testing.v1 import AppTest
+
+    from mock_api import make_server
+
+    server, _ = make_server(200, 0)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    work_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    # Antes de importar la app: servidor simulado, cachés temporales y sin precarga en segundo plano
+    os.environ.update({
+        "YOUTUBE_API_BASE_URL": base_url,
+        "CLOUD_RUN_URL": base_url,
+        "YT_CACHE_PATH": os.path.join(work_dir, "youtube_api.sqlite"),
+        "UPLOAD_JOBS_DIR": os.path.join(work_dir, "upload_jobs"),
+        "CHANNEL_CACHE_DIR": os.path.join(work_dir, "channels"),
+        "TRENDS_CACHE_PATH": os.path.join(work_dir, "trends.sqlite"),
+        "PREFETCH_INTERVAL": "0",
+    })
+
+    results = {}
+    for view in ["Tendencias", "Buscar", "Nicho", "Popularidad"]:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.secrets["YOUTUBE_API_KEY"] = "bench"
+        at.session_state["active_tab"] = view
+        t0 = time.perf_counter()
+        at.run()
+        results[view] = time.perf_counter() - t0
+    server.shutdown()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    print("Import en frío (proceso nuevo):")
+    for module in MODULES:
+        print(f"  {module:20s} {cold_import_time(module) * 1000:8.1f} ms")
+    print("Primer render por vista (AppTest):")
+    for view, elapsed in first_render_times().items():
+        print(f"  {view:20s} {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Subida resumable contra un GCS simulado que implementa el protocolo e inyecta fallos.
+
+El servidor acepta el inicio de sesión (POST + x-goog-resumable: start), los PUT
+por fragmentos con Content-Range y las consultas de estado (bytes */total).
+Con --fail-rate, una fracción de los PUT falla con 503 o corta la conexión a
+mitad de fragmento. El servidor solo guarda el hash de lo recibido (no los
+datos), así el pico de memoria medido es el del cliente. Al final se comprueba
+que el objeto recibido coincide.
+
+    python bench/bench_upload.py --size-mb 64 --fail-rate 0.2
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gcs_upload import upload_file  # noqa: E402
+
+
+class Received:
+    """Bytes recibidos de un objeto: solo tamaño y hash incremental."""
+
+    def __init__(self):
+        self.size = 0
+        self.hash = hashlib.sha256()
+
+    def extend(self, data):
+        self.size += len(data)
+        self.hash.update(data)
+
+    def range_header(self):
+        return {"Range": f"bytes=0-{self.size - 1}"} if self.size else {}
+
+
+def make_gcs_server(fail_rate=0.0, resumable=True, seed=1, youtube_delay=0.0):
+    """GCS simulado; también responde a los endpoints de Cloud Run que usa la subida.
+
+    ``/generate_upload_url/<alias>`` devuelve una URL de este mismo servidor y
+    ``/upload_from_gcs/<alias>`` tarda ``youtube_delay`` segundos y registra la
+    concurrencia máxima por alias en ``state["max_concurrency"]``.
+    """
+    state = {"sessions": {}, "objects": {}, "failures": 0, "requests": 0,
+             "running": {}, "max_concurrency": {}}
+    rnd = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, code, headers=None, body=b""):
+            self.send_response(code)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            state["requests"] += 1
+            if self.path == "/list_channels":
+                body = json.dumps({"canal0": {"title": "Canal 0"}, "canal1": {"title": "Canal 1"}}).encode()
+                return self._reply(200, {"Content-Type": "application/json"}, body)
+            if not self.path.startswith("/generate_upload_url/"):
+                return self._reply(404)
+            alias = self.path.rsplit("/", 1)[1]
+            name = f"{alias}/{uuid.uuid4().hex}.mp4"
+            body = json.dumps({
+                "upload_url": f"http://127.0.0.1:{self.server.server_port}/bucket/{name}",
+                "gcs_path": f"gs://bucket/{name}",
+            }).encode()
+            self._reply(200, {"Content-Type": "application/json"}, body)
+
+        def _upload_from_gcs(self, alias):
+            with lock:
+                state["running"][alias] = state["running"].get(alias, 0) + 1
+                state["max_concurrency"][alias] = max(state["max_concurrency"].get(alias, 0), state["running"][alias])
+            time.sleep(youtube_delay)
+            with lock:
+                state["running"][alias] -= 1
+            video_id = uuid.uuid4().hex[:11]
+            body = json.dumps({"url": f"https://youtu.be/{video_id}", "videoId": video_id}).encode()
+            self._reply(200, {"Content-Type": "application/json"}, body)
+
+        def do_POST(self):
+            state["requests"] += 1
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.startswith("/upload_from_gcs/"):
+                return self._upload_from_gcs(self.path.rsplit("/", 1)[1])
+            if not resumable or self.headers.get("x-goog-resumable") != "start":
+                return self._reply(403, body=b"SignatureDoesNotMatch")
+            session = f"/session/{len(state['sessions'])}"
+            state["sessions"][session] = Received()
+            self._reply(201, {"Location": f"http://127.0.0.1:{self.server.server_port}{session}"})
+
+        def do_PUT(self):
+            state["requests"] += 1
+            length = int(self.headers.get("Content-Length") or 0)
+            if self.path in state["sessions"]:
+                return self._put_chunk(length)
+            # PUT simple a la URL firmada
+            obj = Received()
+            while obj.size < length:
+                obj.extend(self.rfile.read(min(1024 * 1024, length - obj.size)))
+            state["objects"][self.path] = obj.hash.hexdigest()
+            self._reply(200)
+
+        def _put_chunk(self, length):
+            buf = state["sessions"][self.path]
+            spec = self.headers["Content-Range"].split(" ", 1)[1]
+            rng, total = spec.split("/")
+            total = int(total)
+            if rng == "*":
+                self.rfile.read(length)
+                if buf.size == total:
+                    return self._reply(200)
+                return self._reply(308, buf.range_header())
+            start, end = (int(x) for x in rng.split("-"))
+            with lock:
+                fail = rnd.random() < fail_rate
+            if fail:
+                state["failures"] += 1
+                data = self.rfile.read(length // 2)
+                if rnd.random() < 0.5:
+                    # Corte de red: se guarda parte del fragmento y se cierra la conexión
+                    committed = len(data) - len(data) % (256 * 1024)
+                    if start == buf.size:
+                        buf.extend(data[:committed])
+                    self.close_connection = True
+                    return
+                self.rfile.read(length - len(data))
+                return self._reply(503, body=b"backend error")
+            data = self.rfile.read(length)
+            if start != buf.size:
+                return self._reply(308, buf.range_header())
+            buf.extend(data)
+            if buf.size == total and end == total - 1:
+                state["objects"][self.path] = buf.hash.hexdigest()
+                return self._reply(200)
+            return self._reply(308, buf.range_header())
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--fail-rate", type=float, default=0.2)
+    parser.add_argument("--no-resumable", action="store_true", help="simula una URL firmada solo para PUT")
+    args = parser.parse_args()
+
+    server, state = make_gcs_server(args.fail_rate, resumable=not args.no_resumable)
+    with tempfile.TemporaryFile() as f:
+        digest = hashlib.sha256()
+        for _ in range(args.size_mb):
+            block = os.urandom(1024 * 1024)
+            digest.update(block)
+            f.write(block)
+        f.seek(0)
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        upload_file(f"http://127.0.0.1:{server.server_port}/bucket/video.mp4", f)
+        elapsed = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    ok = next(iter(state["objects"].values())) == digest.hexdigest()
+    print(f"{args.size_mb} MB en {elapsed:.2f} s ({args.size_mb / elapsed:.1f} MB/s) · "
+          f"{state['requests']} peticiones · {state['failures']} fallos inyectados · "
+          f"pico de memoria {peak / 1e6:.1f} MB · íntegro: {'sí' if ok else 'NO'}")
+    server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Cola de subidas contra GCS y Cloud Run simulados.
+
+Encola varios vídeos repartidos entre varios canales y espera a que terminen
+sin bloquear el hilo principal; comprueba el límite de concurrencia por canal.
+
+    python bench/bench_upload_jobs.py --jobs 8 --aliases 2 --per-channel 1
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_upload import make_gcs_server  # noqa: E402
+from upload_jobs import ACTIVE_STATES, DONE, UploadJobManager  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--aliases", type=int, default=2)
+    parser.add_argument("--per-channel", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--size-mb", type=int, default=4)
+    parser.add_argument("--youtube-delay", type=float, default=0.5)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server, state = make_gcs_server(args.fail_rate, youtube_delay=args.youtube_delay)
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        manager = UploadJobManager(
+            f"http://127.0.0.1:{server.server_port}", jobs_dir,
+            max_workers=args.workers, max_per_channel=args.per_channel
+        )
+        payload = os.urandom(args.size_mb * 1024 * 1024)
+        t0 = time.perf_counter()
+        ids = [
+            manager.submit(f"canal{i % args.aliases}", io.BytesIO(payload), {"title": f"vídeo {i}"})
+            for i in range(args.jobs)
+        ]
+        submit_time = time.perf_counter() - t0
+        while any(job["status"] in ACTIVE_STATES for job in manager.get(ids)):
+            time.sleep(0.1)
+        elapsed = time.perf_counter() - t0
+        jobs = manager.get(ids)
+
+    done = sum(job["status"] == DONE for job in jobs)
+    print(f"{args.jobs} trabajos encolados en {submit_time * 1000:.0f} ms · terminados en {elapsed:.2f} s · "
+          f"{done} OK / {args.jobs - done} con error · {state['failures']} fallos de GCS inyectados · "
+          f"concurrencia máx. por canal: {state['max_concurrency']}")
+    server.shutdown()
+    sys.exit(0 if done == args.jobs and max(state["max_concurrency"].values()) <= args.per_channel else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Servidor simulado de la YouTube Data API (y del listado de canales de Cloud Run).
+
+Responde a videos (chart=mostPopular o por id), search (paginado con pageToken),
+channels (por id o forHandle=@canalN), playlistItems (subidas de un canal, paginadas)
+y videoCategories con datos sintéticos deterministas o, con --fixtures,
+reproduciendo respuestas grabadas de la API real (``record``). Admite latencia y
+errores inyectados (503 o 403 rateLimitExceeded, que el cliente reintenta).
+Ignora ``fields``: las respuestas llevan siempre todas las claves.
+
+Rutas de control (JSON): ``POST /__config`` cambia la configuración y pone los
+contadores a cero; ``GET /__stats`` devuelve las peticiones recibidas por endpoint.
+
+    python bench/mock_api.py serve --port 8765 --videos 200 --latency 0.05 --error-rate 0.1
+    YOUTUBE_API_KEY=... python bench/mock_api.py record --out fixtures.json --region ES
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = [
+    "lofi", "gameplay", "tutorial", "receta", "minecraft", "música", "relax", "noticias", "asmr",
+    "review", "fútbol", "unboxing", "vlog", "historia", "misterio", "coches", "anime", "entrevista",
+]
+CATEGORIES = {"1": "Film & Animation", "10": "Music", "17": "Sports", "20": "Gaming", "22": "People & Blogs",
+              "24": "Entertainment", "25": "News & Politics", "26": "Howto & Style", "27": "Education"}
+
+DEFAULT_CONFIG = {
+    "videos": 200,        # vídeos totales del corpus (search pagina hasta agotarlos)
+    "page_size": None,    # None: respeta maxResults; si no, ítems por respuesta (sin el límite de 50)
+    "uploads": None,      # vídeos subidos por canal (None: los suyos dentro del corpus)
+    "latency": 0.0,       # segundos por petición
+    "jitter": 0.0,        # +- segundos aleatorios sobre la latencia
+    "error_rate": 0.0,    # fracción de peticiones de YouTube que fallan
+    "seed": 1,
+}
+
+
+class Corpus:
+    """Vídeos, canales y categorías: sintéticos o a partir de fixtures grabados."""
+
+    def __init__(self, fixtures=None, seed=1):
+        self.fixtures = fixtures
+        self.seed = seed
+        if fixtures:
+            self._channels = {c["id"]: c for c in fixtures.get("channels", [])}
+
+    def video(self, i, total):
+        if self.fixtures:
+            base = self.fixtures["videos"]
+            item = copy.deepcopy(base[i % len(base)])
+            if i >= len(base):
+                item["id"] = f"{item['id']}_{i // len(base)}"
+            return item
+        rnd = random.Random(self.seed * 100003 + i)
+        channel = i % max(1, total // 2)
+        title = " ".join(rnd.sample(WORDS, 4)).capitalize() + f" #{i}"
+        return {
+            "id": f"v{i:06d}",
+            "snippet": {
+                "title": title,
+                "description": "",
+                "channelId": f"UC{channel:06d}",
+                "channelTitle": f"Canal {channel}",
+                "categoryId": rnd.choice(list(CATEGORIES)),
+                "publishedAt": f"2026-{rnd.randint(1, 9):02d}-{rnd.randint(1, 28):02d}T12:00:00Z",
+            },
+            "statistics": {
+                "viewCount": str(rnd.randint(100, 5_000_000)),
+                "likeCount": str(rnd.randint(0, 50_000)),
+                "commentCount": str(rnd.randint(0, 5_000)),
+            },
+            "contentDetails": {"duration": f"PT{rnd.randint(0, 59)}M{rnd.randint(1, 59)}S"},
+        }
+
+    def search_item(self, i, total):
+        video = self.video(i, total)
+        return {"id": {"kind": "youtube#video", "videoId": video["id"]}, "snippet": video["snippet"]}
+
+    def channel(self, ch_id, uploads=0):
+        if self.fixtures and ch_id in self._channels:
+            return self._channels[ch_id]
+        rnd = random.Random(f"{self.seed}:{ch_id}")
+        return {
+            "id": ch_id,
+            "snippet": {"title": f"Canal {ch_id}", "description": rnd.choice(["", "gameplay sin cara", "música lofi"]),
+                        "publishedAt": f"20{rnd.randint(10, 25)}-{rnd.randint(1, 12):02d}-01T00:00:00Z"},
+            "statistics": {"subscriberCount": str(rnd.randint(10, 200_000)), "viewCount": str(rnd.randint(1000, 9_000_000)),
+                           "videoCount": str(uploads)},
+            "contentDetails": {"relatedPlaylists": {"uploads": "UU" + ch_id[2:]}},
+        }
+
+    def categories(self):
+        if self.fixtures and self.fixtures.get("videoCategories"):
+            return self.fixtures["videoCategories"]
+        return [{"id": cid, "snippet": {"title": title, "assignable": True}} for cid, title in CATEGORIES.items()]
+
+    def video_by_id(self, video_id, total):
+        if not self.fixtures and video_id.startswith("v") and video_id[1:].isdigit():
+            return self.video(int(video_id[1:]), total)
+        if self.fixtures:
+            base_id, _, rep = video_id.partition("_")
+            for i, v in enumerate(self.fixtures["videos"]):
+                if v["id"] == base_id:
+                    return self.video(i + int(rep or 0) * len(self.fixtures["videos"]), total)
+        return None
+
+
+def make_server(total_videos=DEFAULT_CONFIG["videos"], latency=0.0, error_rate=0.0, fixtures=None,
+                port=0, **config):
+    """Arranca el servidor en un hilo y devuelve (server, state).
+
+    ``state["requests"]`` cuenta todas las peticiones; ``state["by_endpoint"]`` las
+    desglosa y ``state["errors"]`` cuenta los fallos inyectados.
+    """
+    cfg = dict(DEFAULT_CONFIG, videos=total_videos, latency=latency, error_rate=error_rate, **config)
+    state = {"config": cfg, "requests": 0, "errors": 0, "by_endpoint": {}}
+    corpus = [Corpus(fixtures, cfg["seed"])]
+    rnd = random.Random(cfg["seed"])
+    lock = threading.Lock()
+
+    def reset(new_config):
+        with lock:
+            cfg.update(new_config)
+            state.update(requests=0, errors=0, by_endpoint={})
+            corpus[0] = Corpus(fixtures, cfg["seed"])
+            rnd.seed(cfg["seed"])
+
+    def uploads(ch_id, total):
+        """Índices de los vídeos del canal sintético `ch_id` (v. Corpus.video), del más nuevo al más antiguo."""
+        channels = max(1, total // 2)
+        c = int(ch_id[2:]) if ch_id[2:].isdigit() else 0
+        count = cfg["uploads"] if cfg["uploads"] is not None else len(range(c, total, channels))
+        return [c + k * channels for k in reversed(range(count))]
+
+    def page(q, total):
+        size = cfg["page_size"] or int(q.get("maxResults", 5))
+        start = int(q.get("pageToken") or 0)
+        return range(start, min(start + size, total)), (str(start + size) if start + size < total else None)
+
+    def youtube(endpoint, q):
+        total = cfg["videos"]
+        if endpoint == "videoCategories":
+            return {"items": corpus[0].categories()}
+        if endpoint == "videos" and q.get("chart"):
+            indices, _ = page(q, total)
+            return {"items": [corpus[0].video(i, total) for i in indices]}
+        if endpoint == "videos":
+            items = (corpus[0].video_by_id(v, total) for v in q.get("id", "").split(","))
+            return {"items": [item for item in items if item]}
+        if endpoint == "search":
+            indices, next_token = page(q, total)
+            body = {"items": [corpus[0].search_item(i, total) for i in indices]}
+            if next_token:
+                body["nextPageToken"] = next_token
+            return body
+        if endpoint == "channels":
+            ids = q.get("id", "").split(",")
+            if q.get("forHandle", "").lower().startswith("@canal") and q["forHandle"][6:].isdigit():
+                ids = [f"UC{int(q['forHandle'][6:]):06d}"]
+            return {"items": [corpus[0].channel(c, len(uploads(c, total))) for c in ids if c]}
+        if endpoint == "playlistItems":
+            videos = uploads("UC" + q.get("playlistId", "")[2:], total)
+            indices, next_token = page(q, len(videos))
+            body = {"items": [{"contentDetails": {"videoId": f"v{videos[i]:06d}"}} for i in indices]}
+            if next_token:
+                body["nextPageToken"] = next_token
+            return body
+        return {"items": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, code, body):
+            payload = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path != "/__config":
+                return self._reply(404, {})
+            reset(json.loads(body or b"{}"))
+            self._reply(200, cfg)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/__stats":
+                with lock:
+                    return self._reply(200, {k: state[k] for k in ("requests", "errors", "by_endpoint")})
+            endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+            with lock:
+                state["requests"] += 1
+                state["by_endpoint"][endpoint] = state["by_endpoint"].get(endpoint, 0) + 1
+                delay = max(0.0, cfg["latency"] + rnd.uniform(-cfg["jitter"], cfg["jitter"]))
+                fail = endpoint != "list_channels" and rnd.random() < cfg["error_rate"]
+                rate_limited = rnd.random() < 0.5
+            time.sleep(delay)
+            if url.path == "/list_channels":
+                # Stand-in de Cloud Run: canales autorizados para la pestaña Subir Vídeo
+                return self._reply(200, {f"canal{i}": {"title": f"Canal {i}"} for i in range(3)})
+            if fail:
+                with lock:
+                    state["errors"] += 1
+                if rate_limited:
+                    return self._reply(403, {"error": {"code": 403, "errors": [{"reason": "rateLimitExceeded"}]}})
+                return self._reply(503, {"error": {"code": 503, "message": "backendError"}})
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            self._reply(200, youtube(endpoint, q))
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def record(out, region, max_results):
+    """Graba fixtures de la API real: mostPopular de `region`, sus canales y las categorías (~3 unidades)."""
+    from youtube_api import YouTubeClient
+
+    yt = YouTubeClient(os.environ["YOUTUBE_API_KEY"])
+    videos = yt.get("videos", part="snippet,statistics,contentDetails", chart="mostPopular",
+                    regionCode=region, maxResults=max_results).get("items", [])
+    channel_ids = list(dict.fromkeys(v["snippet"]["channelId"] for v in videos))
+    channels = yt.get("channels", part="snippet,statistics", id=",".join(channel_ids[:50])).get("items", [])
+    categories = yt.get("videoCategories", part="snippet", regionCode=region).get("items", [])
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"videos": videos, "channels": channels, "videoCategories": categories}, f, ensure_ascii=False)
+    print(f"{len(videos)} vídeos, {len(channels)} canales y {len(categories)} categorías -> {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve")
+    serve.add_argument("--port", type=int, default=8765, help="0 elige un puerto libre")
+    serve.add_argument("--videos", type=int, default=DEFAULT_CONFIG["videos"])
+    serve.add_argument("--page-size", type=int, default=None)
+    serve.add_argument("--uploads", type=int, default=None, help="vídeos subidos por canal")
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--jitter", type=float, default=0.0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--fixtures", help="JSON grabado con `record`")
+    rec = sub.add_parser("record")
+    rec.add_argument("--out", default="fixtures.json")
+    rec.add_argument("--region", default="ES")
+    rec.add_argument("--max-results", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        return record(args.out, args.region, args.max_results)
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            fixtures = json.load(f)
+    server, _ = make_server(args.videos, args.latency, args.error_rate, fixtures, port=args.port,
+                            page_size=args.page_size, uploads=args.uploads, jitter=args.jitter)
+    # La primera línea indica el puerto (la lee bench_flows al arrancarlo como subproceso)
+    print(f"PORT {server.server_port}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
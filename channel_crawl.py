@@ -0,0 +1,238 @@
+"""Rastreo de todos los vídeos de un canal a partir de su lista de subidas.
+
+playlistItems (1 unidad por página de 50) da los IDs de la lista de subidas, de más
+nuevo a más antiguo, y videos.list (1 unidad por lote de 50) sus estadísticas; search
+costaría 100 unidades por página. Los vídeos se guardan por canal en Parquet:
+
+    .cache/channels/UC.../crawl-20261018T070000.parquet
+
+Cada rastreo escribe un fichero nuevo lote a lote (memoria acotada aunque el canal
+tenga decenas de miles de subidas) y, si no es completo, se para en el primer vídeo
+que ya estaba guardado.
+"""
+import contextvars
+import datetime
+import glob
+import json
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from normalize import videos_frame
+from quota import cost_of
+
+CHANNEL_CACHE_DIR = os.environ.get("CHANNEL_CACHE_DIR", os.path.join(".cache", "channels"))
+BATCH_SIZE = 50
+DEFAULT_CONCURRENCY = int(os.environ.get("CRAWL_CONCURRENCY", "4"))
+
+CHANNEL_FIELDS = (
+    "items(id,snippet(title,customUrl),statistics(videoCount,subscriberCount,viewCount),"
+    "contentDetails/relatedPlaylists/uploads)"
+)
+PLAYLIST_FIELDS = "nextPageToken,items(contentDetails/videoId)"
+VIDEO_FIELDS = (
+    "items(id,snippet(title,publishedAt),statistics(viewCount,likeCount,commentCount),contentDetails/duration)"
+)
+
+SCHEMA = pa.schema([
+    ("video_id", pa.string()),
+    ("title", pa.string()),
+    ("published_at", pa.timestamp("s", tz="UTC")),
+    ("views", pa.int64()),
+    ("likes", pa.int64()),
+    ("comments", pa.int64()),
+    ("duration_s", pa.int64()),
+    ("crawled_at", pa.timestamp("s", tz="UTC")),
+])
+
+# Cortes (vistas/día) del histograma de la vista
+VIEWS_PER_DAY_BINS = [0, 10, 100, 1_000, 10_000, 100_000, np.inf]
+VIEWS_PER_DAY_LABELS = ["<10", "10–100", "100–1k", "1k–10k", "10k–100k", "≥100k"]
+
+
+class CrawlError(Exception):
+    """La API devolvió un error (cuota agotada, 4xx...): el rastreo se descarta entero."""
+
+
+def _check(res):
+    if "error" in res:
+        err = res["error"]
+        reason = err.get("message") or ", ".join(e.get("reason", "") for e in err.get("errors", []))
+        raise CrawlError(f"Error {err.get('code')} de la API de YouTube: {reason}")
+    return res
+
+
+def resolve_channel(yt, text):
+    """Item de channels.list a partir de un ID (UC...), un @handle o la URL del canal; None si no existe."""
+    text = text.strip()
+    channel_id = re.search(r"UC[\w-]{22}", text)
+    if channel_id:
+        params = {"id": channel_id.group()}
+    else:
+        handle = re.search(r"@([\w.\-]+)", text)
+        params = {"forHandle": "@" + (handle.group(1) if handle else text.rsplit("/", 1)[-1])}
+    res = _check(yt.get("channels", part="snippet,statistics,contentDetails", fields=CHANNEL_FIELDS, **params))
+    items = res.get("items", [])
+    return items[0] if items else None
+
+
+def estimate_quota(new_videos):
+    """Coste de rastrear `new_videos` vídeos: una página de playlistItems y un lote de videos por cada 50."""
+    batches = -(-max(new_videos, 1) // BATCH_SIZE)
+    return batches * (cost_of("playlistItems") + cost_of("videos"))
+
+
+class ChannelStore:
+    """Vídeos rastreados de un canal (ficheros Parquet) y el estado del último rastreo (JSON)."""
+
+    def __init__(self, channel_id, root=CHANNEL_CACHE_DIR):
+        self.channel_id = channel_id
+        self.dir = os.path.join(root, channel_id)
+        self._state_path = os.path.join(self.dir, "state.json")
+
+    def parts(self):
+        return sorted(glob.glob(os.path.join(self.dir, "crawl-*.parquet")))
+
+    def state(self):
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_state(self, **state):
+        state = dict(self.state(), **state)
+        os.makedirs(self.dir, exist_ok=True)
+        with open(self._state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def known_ids(self):
+        parts = self.parts()
+        if not parts:
+            return set()
+        return set(pq.ParquetDataset(parts).read(columns=["video_id"]).column("video_id").to_pylist())
+
+    def load(self):
+        """Todos los vídeos guardados; si uno aparece en varios rastreos, gana el más reciente."""
+        parts = self.parts()
+        if not parts:
+            return pd.DataFrame(columns=SCHEMA.names)
+        df = pq.ParquetDataset(parts).read().to_pandas()
+        df = df.sort_values("crawled_at").drop_duplicates("video_id", keep="last")
+        for col in ("views", "likes", "comments", "duration_s"):
+            df[col] = df[col].astype("Int64")
+        return df.sort_values("published_at", ascending=False).reset_index(drop=True)
+
+
+def iter_upload_ids(yt, playlist_id, known_ids=frozenset()):
+    """Lotes de hasta 50 IDs nuevos de la lista de subidas, parando en el primero ya conocido.
+
+    Siempre contra la API (`refresh`): con la caché, un rastreo reciente no vería las subidas nuevas.
+    """
+    next_page = None
+    while True:
+        res = _check(yt.refresh("playlistItems", part="contentDetails", playlistId=playlist_id, maxResults=BATCH_SIZE,
+                                pageToken=next_page, fields=PLAYLIST_FIELDS))
+        ids = [item["contentDetails"]["videoId"] for item in res.get("items", [])]
+        new_ids = []
+        for video_id in ids:
+            if video_id in known_ids:
+                break
+            new_ids.append(video_id)
+        if new_ids:
+            yield new_ids
+        next_page = res.get("nextPageToken")
+        if len(new_ids) < len(ids) or not next_page:
+            return
+
+
+def fetch_videos_batch(yt, video_ids, crawled_at):
+    # Estadísticas recién pedidas: se guardan con `crawled_at` y de ahí salen las vistas por día
+    res = _check(yt.refresh("videos", part="snippet,statistics,contentDetails", id=",".join(video_ids),
+                            maxResults=BATCH_SIZE, fields=VIDEO_FIELDS))
+    df = videos_frame(res.get("items", []))
+    if df.empty:
+        return None
+    df = df.reindex(columns=SCHEMA.names)
+    df["crawled_at"] = pd.Timestamp(crawled_at)
+    df["published_at"] = df["published_at"].dt.floor("s")
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+def crawl_channel(yt, channel, store, full=False, concurrency=DEFAULT_CONCURRENCY):
+    """Descarga los vídeos nuevos del canal (todos con `full`) y genera cuántos lleva guardados.
+
+    Las páginas de playlistItems van en serie y los lotes de videos.list en paralelo, con
+    como mucho 2×`concurrency` lotes pendientes: la memoria no depende del tamaño del canal.
+    """
+    crawled_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    known = frozenset() if full else store.known_ids()
+    os.makedirs(store.dir, exist_ok=True)
+    path = os.path.join(store.dir, f"crawl-{crawled_at:%Y%m%dT%H%M%S}.parquet")
+    previous = store.parts()
+    writer, stored, pending, completed = None, 0, set(), False
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def drain():
+        nonlocal writer, stored
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            pending.discard(f)
+            table = f.result()
+            if table is not None:
+                if writer is None:
+                    writer = pq.ParquetWriter(path + ".tmp", SCHEMA, compression="zstd")
+                writer.write_table(table)
+                stored += table.num_rows
+
+    try:
+        uploads = channel["contentDetails"]["relatedPlaylists"]["uploads"]
+        for ids in iter_upload_ids(yt, uploads, known):
+            # Con el contexto del llamante, para atribuir las llamadas a su sesión (telemetry)
+            pending.add(pool.submit(contextvars.copy_context().run, fetch_videos_batch, yt, ids, crawled_at))
+            if len(pending) >= 2 * concurrency:
+                drain()
+                yield stored
+        while pending:
+            drain()
+            yield stored
+        completed = True
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        if writer is not None:
+            writer.close()
+            # Solo un rastreo terminado pasa a ser visible; uno interrumpido se descarta
+            if completed:
+                os.replace(path + ".tmp", path)
+            else:
+                os.remove(path + ".tmp")
+    if full and writer is not None:
+        for old in previous:
+            os.remove(old)
+    store.save_state(title=channel["snippet"]["title"], uploads=uploads, last_crawl=crawled_at.isoformat())
+    yield stored
+
+
+def channel_metrics(df):
+    """Ritmo de subida, distribución de vistas/día y mejores vídeos a partir de los vídeos guardados."""
+    age_days = ((df["crawled_at"] - df["published_at"]).dt.total_seconds() / 86400).clip(lower=1)
+    df = df.assign(views_per_day=(df["views"].astype("float64") / age_days).round(1))
+    published = df["published_at"].sort_values()
+    newest = df["crawled_at"].max()
+    weekly = df.set_index("published_at")["video_id"].resample("W").count()
+    return {
+        "videos": df,
+        "weekly": weekly[weekly.index >= newest - pd.Timedelta(weeks=52)],
+        "median_gap_days": published.diff().dt.total_seconds().median() / 86400 if len(df) > 1 else None,
+        "last_30d": int((published >= newest - pd.Timedelta(days=30)).sum()),
+        "last_90d": int((published >= newest - pd.Timedelta(days=90)).sum()),
+        "views_per_day_hist": pd.cut(
+            df["views_per_day"], VIEWS_PER_DAY_BINS, labels=VIEWS_PER_DAY_LABELS, right=False
+        ).value_counts().reindex(VIEWS_PER_DAY_LABELS),
+        "top": df.nlargest(10, "views_per_day"),
+    }
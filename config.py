@@ -0,0 +1,25 @@
+import os
+
+COUNTRIES = {"México": "MX", "España": "ES", "Estados Unidos": "US", "India": "IN", "Brasil": "BR", "Canadá": "CA"}
+
+# Idiomas habituales de los títulos de cada región (stopwords del análisis de títulos)
+COUNTRY_LANGUAGES = {
+    "MX": ("es",), "ES": ("es",), "US": ("en",), "IN": ("en", "hi"), "BR": ("pt",), "CA": ("en", "fr"),
+}
+
+CLOUD_RUN_URL = os.environ.get("CLOUD_RUN_URL", "https://youtube-uploader-service-183426857852.us-central1.run.app")
+
+# Cuota diaria de la YouTube Data API que puede gastar este proceso (aviso previo en Nicho)
+QUOTA_BUDGET = int(os.environ.get("YOUTUBE_QUOTA_BUDGET", "10000"))
+
+# Si se define, las métricas se sirven en formato Prometheus en http://0.0.0.0:<puerto>/metrics
+METRICS_PORT = int(os.environ["METRICS_PORT"]) if os.environ.get("METRICS_PORT") else None
+
+# Google Trends: llamadas por minuto que se permite el proceso (en ráfagas de hasta 5) y caché en disco
+TRENDS_REQUESTS_PER_MINUTE = int(os.environ.get("TRENDS_REQUESTS_PER_MINUTE", "10"))
+TRENDS_CACHE_PATH = os.environ.get("TRENDS_CACHE_PATH", os.path.join(".cache", "trends.sqlite"))
+
+# Precarga del chart y las categorías de todas las regiones: segundos por pasada (0 la desactiva)
+# y unidades de cuota al día que puede gastar
+PREFETCH_INTERVAL = int(os.environ.get("PREFETCH_INTERVAL", "600"))
+PREFETCH_QUOTA = int(os.environ.get("PREFETCH_QUOTA", "1500"))
@@ -0,0 +1,159 @@
+"""Subida de vídeos a GCS con URL firmada: resumable por fragmentos y con progreso.
+
+Protocolo (uploads resumables de la XML API de GCS):
+
+1. POST a la URL firmada con ``x-goog-resumable: start`` -> 201 + ``Location`` (URI de sesión).
+2. PUT de cada fragmento con ``Content-Range: bytes a-b/total`` -> 308 (+ ``Range`` confirmado)
+   o 200/201 al completar.
+3. Tras un fallo, PUT vacío con ``Content-Range: bytes */total`` devuelve el offset confirmado
+   y se reanuda desde ahí.
+
+La URL firmada tiene que permitir POST con esa cabecera; si no (URL firmada solo para PUT),
+se hace un único PUT en streaming, igualmente con progreso y sin cargar el fichero en memoria.
+"""
+import io
+import random
+import shutil
+import tempfile
+import time
+
+import requests
+
+from youtube_api import http_request
+
+# GCS exige fragmentos múltiplos de 256 KiB (salvo el último)
+CHUNK_SIZE = 32 * 256 * 1024  # 8 MiB
+SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+CHUNK_TIMEOUT = (10, 120)
+SIMPLE_UPLOAD_TIMEOUT = (10, 600)
+
+
+class UploadError(Exception):
+    pass
+
+
+def _offset_from_range(resp):
+    # "Range: bytes=0-1048575" -> siguiente byte a enviar; sin cabecera, no hay nada confirmado
+    rng = resp.headers.get("Range")
+    return int(rng.rsplit("-", 1)[1]) + 1 if rng else 0
+
+
+def ensure_seekable(fileobj):
+    """Devuelve un fichero con seek(); si no lo es, lo vuelca a un SpooledTemporaryFile acotado."""
+    try:
+        fileobj.seek(0)
+        return fileobj
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        shutil.copyfileobj(fileobj, spooled, CHUNK_SIZE)
+        spooled.seek(0)
+        return spooled
+
+
+def file_size(fileobj):
+    fileobj.seek(0, io.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def start_resumable_session(upload_url, content_type):
+    """URI de la sesión resumable, o None si la URL firmada no admite el inicio por POST."""
+    resp = http_request(
+        "POST", upload_url, headers={"x-goog-resumable": "start", "Content-Type": content_type},
+        timeout=CHUNK_TIMEOUT
+    )
+    if resp.status_code in (200, 201) and resp.headers.get("Location"):
+        return resp.headers["Location"]
+    return None
+
+
+def committed_offset(session_url, total):
+    """Pregunta a GCS cuántos bytes de la sesión tiene ya guardados."""
+    resp = http_request("PUT", session_url, headers={"Content-Range": f"bytes */{total}"}, timeout=CHUNK_TIMEOUT)
+    if resp.status_code in (200, 201):
+        return total
+    if resp.status_code == 308:
+        return _offset_from_range(resp)
+    raise UploadError(f"Estado de la subida desconocido ({resp.status_code}): {resp.text}")
+
+
+def resumable_upload(session_url, fileobj, total, chunk_size=CHUNK_SIZE, on_progress=None,
+                     max_retries=5, backoff=1.0):
+    """Sube `fileobj` por fragmentos; un fallo reintenta desde el último offset confirmado."""
+    offset, failures = 0, 0
+    start = time.monotonic()
+    while offset < total:
+        fileobj.seek(offset)
+        chunk = fileobj.read(chunk_size)
+        end = offset + len(chunk) - 1
+        try:
+            resp = http_request(
+                "PUT", session_url, data=chunk,
+                headers={"Content-Range": f"bytes {offset}-{end}/{total}"}, timeout=CHUNK_TIMEOUT
+            )
+        except requests.RequestException as e:
+            resp, error = None, str(e)
+        else:
+            error = f"{resp.status_code}: {resp.text}"
+
+        if resp is not None and resp.status_code in (200, 201):
+            offset = total
+        elif resp is not None and resp.status_code == 308:
+            offset = _offset_from_range(resp)
+            failures = 0
+        elif resp is not None and resp.status_code < 500 and resp.status_code not in (408, 429):
+            raise UploadError(f"GCS rechazó el fragmento ({error})")
+        else:
+            failures += 1
+            if failures > max_retries:
+                raise UploadError(f"Demasiados fallos seguidos al subir a GCS ({error})")
+            time.sleep(backoff * (2 ** (failures - 1)) * random.uniform(0.5, 1.5))
+            try:
+                offset = committed_offset(session_url, total)
+            except requests.RequestException:
+                pass  # se reintenta con el offset que teníamos
+        if on_progress:
+            on_progress(offset, total, time.monotonic() - start)
+
+
+class _ProgressReader:
+    """Envuelve un fichero para que requests lo envíe en streaming informando del progreso."""
+
+    def __init__(self, fileobj, total, on_progress):
+        self._f = fileobj
+        self._total = total
+        self._sent = 0
+        self._start = time.monotonic()
+        self._on_progress = on_progress
+
+    def __len__(self):
+        return self._total
+
+    def read(self, size=-1):
+        data = self._f.read(CHUNK_SIZE if size is None or size < 0 else size)
+        self._sent += len(data)
+        if self._on_progress:
+            self._on_progress(self._sent, self._total, time.monotonic() - self._start)
+        return data
+
+
+def simple_upload(upload_url, fileobj, total, content_type, on_progress=None):
+    fileobj.seek(0)
+    resp = http_request(
+        "PUT", upload_url, data=_ProgressReader(fileobj, total, on_progress),
+        headers={"Content-Type": content_type, "Content-Length": str(total)}, timeout=SIMPLE_UPLOAD_TIMEOUT
+    )
+    if resp.status_code not in (200, 201):
+        raise UploadError(f"Error al subir a GCS ({resp.status_code}): {resp.text}")
+
+
+def upload_file(upload_url, fileobj, content_type="video/mp4", on_progress=None, chunk_size=CHUNK_SIZE):
+    """Sube `fileobj` a la URL firmada: resumable si la URL lo permite, PUT en streaming si no."""
+    fileobj = ensure_seekable(fileobj)
+    total = file_size(fileobj)
+    session_url = start_resumable_session(upload_url, content_type)
+    if session_url and total:
+        resumable_upload(session_url, fileobj, total, chunk_size, on_progress)
+    else:
+        simple_upload(upload_url, fileobj, total, content_type, on_progress)
@@ -0,0 +1,235 @@
+"""Motor de análisis de nichos, independiente de Streamlit.
+
+La pestaña Nicho lo usa para una palabra clave; la CLI escanea muchas en paralelo
+bajo un presupuesto de cuota compartido y va escribiendo resultados a CSV/Parquet:
+
+    YOUTUBE_API_KEY=... python niche_engine.py semillas.txt --out nichos.parquet --quota 9000
+"""
+import argparse
+import datetime
+import math
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from analysis import KeywordCounts
+from niche_pipeline import CHANNELS_BATCH_SIZE, SEARCH_PAGE_SIZE, ScanError, iter_niche
+from niche_score import RAW_COLUMNS, parse_weights, rank_channels
+from quota import QuotaBudget, QuotaExceeded, cost_of
+
+CHANNEL_COLUMNS = ["channel_id", "channel", "subscribers", "views_total", "video_count", "ratio", "views_per_video",
+                   "subs_per_day", "days_since_upload", "faceless", "niche", "score", "link"]
+
+
+def channel_record(ch_id, item):
+    """Campos de un item de channels.list que usa la puntuación (niche_score)."""
+    stats = item.get("statistics", {})
+    return (ch_id, item["snippet"]["title"], item["snippet"].get("description", ""),
+            int(stats.get("subscriberCount", 0)), int(stats.get("viewCount", 0)), int(stats.get("videoCount", 0)),
+            item["snippet"].get("publishedAt"))
+
+
+class NicheAggregate:
+    """Resultados acumulados de un escaneo: contadores y los campos de cada canal revisado.
+
+    Los items de search y channels se reducen a lo imprescindible al llegar y se
+    descartan. Filtros, señales y puntuación se calculan en bloque en `frame`
+    (niche_score), de modo que cambiar la heurística no toca la descarga.
+    """
+
+    def __init__(self, max_subs, max_views, keyword="", weights=None, top_k=None):
+        self.max_subs = max_subs
+        self.max_views = max_views
+        self.keyword = keyword
+        self.weights = weights
+        self.top_k = top_k
+        self.videos = 0
+        self.channels_checked = 0
+        self.words = KeywordCounts()
+        self.channels = {}
+        self.last_upload = {}  # channel_id -> publishedAt (ISO) de su vídeo más reciente en la búsqueda
+
+    def add(self, kind, payload):
+        if kind == "videos":
+            self.videos += len(payload)
+            self.words.add_titles(item["snippet"]["title"] for item in payload)
+            for item in payload:
+                ch_id, published = item["snippet"]["channelId"], item["snippet"].get("publishedAt", "")
+                if published > self.last_upload.get(ch_id, ""):
+                    self.last_upload[ch_id] = published
+            return
+        self.channels_checked += len(payload)
+        for ch_id, item in payload.items():
+            self.channels[ch_id] = channel_record(ch_id, item)
+
+    def frame(self):
+        """Canales que cumplen los filtros, de mayor a menor puntuación."""
+        raw = pd.DataFrame(list(self.channels.values()), columns=RAW_COLUMNS[:-1])
+        raw["last_upload"] = raw["channel_id"].map(self.last_upload)
+        df = rank_channels(raw, self.max_subs, self.max_views, self.keyword, self.weights, self.top_k)
+        return df.assign(link="https://www.youtube.com/channel/" + df["channel_id"])[CHANNEL_COLUMNS]
+
+
+def estimate_quota(max_results):
+    """Cota superior del coste de un escaneo sin caché: páginas de search + lotes de channels."""
+    pages = math.ceil(max_results / SEARCH_PAGE_SIZE)
+    channel_batches = math.ceil(max_results / CHANNELS_BATCH_SIZE)
+    return pages * cost_of("search") + channel_batches * cost_of("channels")
+
+
+def iter_scan(yt, keyword, max_subs=50000, max_views=5000000, months_old=2, max_results=100,
+              cancel_event=None, weights=None, top_k=None):
+    """Escanea una palabra clave: canales pequeños que publican sobre ella y palabras de sus títulos.
+
+    Genera el mismo NicheAggregate tras cada página de search y cada lote de canales resueltos.
+    """
+    # Redondeada al día (UTC): con la hora exacta, cada búsqueda tendría otra clave en la caché de respuestas
+    fecha = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30 * months_old)
+    fecha_limite = f"{fecha:%Y-%m-%d}T00:00:00Z"
+    agg = NicheAggregate(max_subs, max_views, keyword, weights, top_k)
+    for kind, payload in iter_niche(
+        yt, max_results, cancel_event=cancel_event,
+        part="snippet", type="video", order="viewCount", q=keyword, publishedAfter=fecha_limite
+    ):
+        agg.add(kind, payload)
+        yield agg
+
+
+def scan_keyword(yt, keyword, **scan_params):
+    """Escaneo completo de una palabra clave: devuelve (DataFrame de canales, KeywordCounts de los títulos)."""
+    agg = NicheAggregate(scan_params.get("max_subs", 50000), scan_params.get("max_views", 5000000), keyword,
+                         scan_params.get("weights"), scan_params.get("top_k"))
+    for agg in iter_scan(yt, keyword, **scan_params):
+        pass
+    return agg.frame(), agg.words
+
+
+class ResultWriter:
+    """Escribe resultados por lotes a medida que llegan (CSV o Parquet según la extensión)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = path.endswith(".parquet")
+        self._writer = None
+        self._started = False
+        self._lock = threading.Lock()
+
+    def write(self, df):
+        with self._lock:
+            if self._parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if self._writer is None:
+                    self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+                self._writer.write_table(table.cast(self._writer.schema))
+            else:
+                df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+            self._started = True
+
+    def close(self):
+        if self._parquet and self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(yt, keywords, out_path, concurrency=4, top_words=15, **scan_params):
+    """Escanea `keywords` en paralelo y vuelca cada resultado en cuanto termina.
+
+    Con presupuesto de cuota en el cliente, cada palabra aparta antes de empezar su coste
+    máximo (`estimate_quota`) y devuelve lo que no gasta al terminar: solo empiezan las que
+    caben, así que un presupuesto justo acaba unas cuantas palabras en vez de dejarlas todas
+    a medias. Las que no caben, o fallan por un error de la API, se dan por omitidas.
+    Devuelve un resumen {"done": [...], "skipped": [...]}.
+    """
+    from youtube_api import YouTubeClient
+
+    estimate = estimate_quota(scan_params.get("max_results", 100))
+    writer = ResultWriter(out_path)
+    summary = {"done": [], "skipped": []}
+    queue = list(keywords)
+    futures = {}
+
+    def start(kw):
+        if yt.budget is None:
+            client, reservation = yt, None
+        else:
+            reservation = yt.budget.reserve(estimate)
+            client = YouTubeClient(yt.api_key, yt.base_url, cache=yt.cache, budget=reservation)
+        futures[pool.submit(scan_keyword, client, kw, **scan_params)] = (kw, reservation)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while queue or futures:
+                while queue and len(futures) < concurrency:
+                    try:
+                        start(queue[0])
+                    except QuotaExceeded:
+                        if not futures:
+                            # Sin escaneos en curso no se va a liberar nada más
+                            summary["skipped"].extend(queue)
+                            queue.clear()
+                        break
+                    queue.pop(0)
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kw, reservation = futures.pop(future)
+                    if reservation is not None:
+                        yt.budget.release(reservation)
+                    try:
+                        channels, words = future.result()
+                    except (QuotaExceeded, ScanError):
+                        summary["skipped"].append(kw)
+                        continue
+                    if not channels.empty:
+                        top = ", ".join(w for w, _ in words.most_common(top_words))
+                        phrases = ", ".join(p for p, _ in words.most_common(top_words, sizes=(2, 3)))
+                        writer.write(channels.assign(keyword=kw, top_words=top, top_phrases=phrases))
+                    summary["done"].append(kw)
+    finally:
+        writer.close()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("keywords", help="fichero con una palabra clave por línea")
+    parser.add_argument("--out", default="nichos.csv", help="salida .csv o .parquet")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--quota", type=int, default=9000, help="unidades de cuota disponibles para el lote")
+    parser.add_argument("--max-subs", type=int, default=50000)
+    parser.add_argument("--max-views", type=int, default=5000000)
+    parser.add_argument("--months", type=int, default=2)
+    parser.add_argument("--max-videos", type=int, default=100)
+    parser.add_argument("--weights", default="", help="pesos de la puntuación, p. ej. ratio=0.5,growth=0.3")
+    parser.add_argument("--top", type=int, help="solo los N canales con mejor puntuación por palabra clave")
+    args = parser.parse_args(argv)
+    try:
+        weights = parse_weights(args.weights)
+    except ValueError as e:
+        parser.error(str(e))
+
+    from api_cache import ResponseCache
+    from youtube_api import YouTubeClient
+
+    with open(args.keywords, encoding="utf-8") as f:
+        keywords = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    budget = QuotaBudget(args.quota)
+    yt = YouTubeClient(os.environ["YOUTUBE_API_KEY"], cache=ResponseCache(), budget=budget)
+    summary = run_batch(
+        yt, keywords, args.out, concurrency=args.concurrency, max_subs=args.max_subs,
+        max_views=args.max_views, months_old=args.months, max_results=args.max_videos,
+        weights=weights, top_k=args.top
+    )
+    print(f"{len(summary['done'])} palabras escaneadas, {len(summary['skipped'])} omitidas (cuota o error de la API); "
+          f"{budget.used} unidades usadas -> {args.out}")
+    return 0 if not summary["skipped"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+CHANNELS_BATCH_SIZE = 50
+SEARCH_PAGE_SIZE = 50
+DEFAULT_CONCURRENCY = int(os.environ.get("NICHE_CONCURRENCY", "4"))
+
+SEARCH_FIELDS = "nextPageToken,items(snippet(title,channelId,publishedAt))"
+CHANNEL_FIELDS = "items(id,snippet(title,description,publishedAt),statistics(subscriberCount,viewCount,videoCount))"
+
+
+class ScanCancelled(Exception):
+    """El usuario cambió la búsqueda mientras el escaneo seguía en curso."""
+
+
+class ScanError(Exception):
+    """La API devolvió un error (cuota agotada, 4xx...): el escaneo no está completo."""
+
+
+def _check(res):
+    if "error" in res:
+        err = res["error"]
+        reason = err.get("message") or ", ".join(e.get("reason", "") for e in err.get("errors", []))
+        raise ScanError(f"Error {err.get('code')} de la API de YouTube: {reason}")
+    return res
+
+
+def fetch_channels_batch(yt, channel_ids):
+    """Una llamada a channels.list para hasta 50 IDs; devuelve {channel_id: item}."""
+    ch_data = _check(yt.get(
+        "channels", part="snippet,statistics", id=",".join(channel_ids),
+        maxResults=CHANNELS_BATCH_SIZE, fields=CHANNEL_FIELDS
+    ))
+    return {c["id"]: c for c in ch_data.get("items", [])}
+
+
+def iter_search_pages(yt, max_results, cancel_event=None, **search_params):
+    """Itera las páginas de search (50 resultados) hasta reunir `max_results` vídeos."""
+    fetched = 0
+    next_page = None
+    while fetched < max_results:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+        res = _check(yt.get("search", maxResults=SEARCH_PAGE_SIZE, pageToken=next_page, fields=SEARCH_FIELDS,
+                            **search_params))
+        items = res.get("items", [])
+        fetched += len(items)
+        yield items
+        next_page = res.get("nextPageToken")
+        if not next_page:
+            break
+
+
+def iter_niche(yt, max_results, concurrency=DEFAULT_CONCURRENCY, cancel_event=None, **search_params):
+    """Pagina search y resuelve canales en paralelo, entregando cada resultado en cuanto llega.
+
+    Genera ("videos", items) por cada página de search y ("channels", {channel_id: item})
+    por cada lote de channels.list, en orden de llegada. Las páginas van en serie (cada
+    una necesita el pageToken anterior), pero se piden en el pool mientras los lotes de
+    canales de las páginas anteriores se resuelven.
+    """
+    pages = iter_search_pages(yt, max_results, cancel_event, **search_params)
+    # Con el contexto del llamante, para atribuir las llamadas a su sesión (telemetry)
+    pool = ThreadPoolExecutor(max_workers=concurrency + 1)
+
+    def submit(fn, *args):
+        return pool.submit(contextvars.copy_context().run, fn, *args)
+
+    seen, pending = set(), set()
+    page_future = submit(next, pages, None)
+    try:
+        while page_future is not None or pending:
+            done, _ = wait(pending | ({page_future} if page_future else set()), return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                raise ScanCancelled()
+            for f in done:
+                if f is page_future:
+                    items = f.result()
+                    if items is None:
+                        page_future = None
+                        continue
+                    page_future = submit(next, pages, None)
+                    new_ids = [ch for ch in dict.fromkeys(i["snippet"]["channelId"] for i in items) if ch not in seen]
+                    seen.update(new_ids)
+                    for i in range(0, len(new_ids), CHANNELS_BATCH_SIZE):
+                        pending.add(submit(fetch_channels_batch, yt, new_ids[i:i + CHANNELS_BATCH_SIZE]))
+                    yield "videos", items
+                else:
+                    pending.discard(f)
+                    yield "channels", f.result()
+    finally:
+        # Si se cancela (o Streamlit interrumpe el script) no seguimos gastando cuota
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,108 @@
+"""Puntuación de oportunidad de los canales candidatos de un nicho, en bloque.
+
+Cada función trabaja sobre el DataFrame completo de canales: las señales de texto
+(faceless y palabras de la búsqueda) con una sola expresión regular compilada por
+señal (``keyword_pattern``), y ratio, crecimiento y actividad reciente con operaciones de NumPy. Así,
+puntuar y ordenar miles de candidatos tras cada lote cuesta milisegundos, y la
+heurística se ajusta con los pesos sin tocar la descarga.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from analysis import FACELESS_KEYWORDS, MIN_WORD_LEN, TOKEN_PATTERN, fold, stopwords_for
+
+RAW_COLUMNS = ["channel_id", "channel", "description", "subscribers", "views_total", "video_count",
+               "created_at", "last_upload"]
+
+# Peso de cada señal en la puntuación (se normalizan para que sumen 1)
+DEFAULT_WEIGHTS = {
+    "ratio": 0.30,            # vistas por suscriptor: el contenido llega más allá de la base de fans
+    "views_per_video": 0.20,
+    "growth": 0.20,           # suscriptores por día desde la creación del canal
+    "recency": 0.15,          # días desde su último vídeo en la búsqueda (menos es mejor)
+    "faceless": 0.10,
+    "niche": 0.05,            # fracción de las palabras de la búsqueda en su título o descripción
+}
+
+
+def keyword_pattern(words):
+    """Alternancia compilada (más largas primero) de `words` normalizadas con `fold`; None si no hay ninguna."""
+    alternatives = sorted({fold(w) for w in words if w}, key=len, reverse=True)
+    if not alternatives:
+        return None
+    return re.compile("|".join(map(re.escape, alternatives)))
+
+
+FACELESS_PATTERN = keyword_pattern(FACELESS_KEYWORDS)
+
+
+def parse_weights(text):
+    """"ratio=0.5,growth=0.3" -> DEFAULT_WEIGHTS con esos valores cambiados."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, value = part.partition("=")
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Señal desconocida: {name} (válidas: {', '.join(DEFAULT_WEIGHTS)})")
+        weights[name] = float(value)
+    return weights
+
+
+def _safe_ratio(num, den):
+    num, den = np.asarray(num, dtype="float64"), np.asarray(den, dtype="float64")
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+
+def features(channels, keyword="", now=None):
+    """Añade las señales de cada canal: ratio, views_per_video, subs_per_day, days_since_upload, faceless y niche."""
+    now = pd.Timestamp.now(tz="UTC") if now is None else now
+    text = (channels["channel"].fillna("") + " " + channels["description"].fillna("")).map(fold)
+    terms = [t for t in dict.fromkeys(fold(m) for m in TOKEN_PATTERN.findall(keyword))
+             if len(t) >= MIN_WORD_LEN and t not in stopwords_for()]
+    # Una sola pasada con la alternancia de todas las palabras: cuántas distintas aparecen en cada canal
+    pattern = keyword_pattern(terms)
+    niche = 0
+    if pattern is not None:
+        found = text.str.extractall(f"({pattern.pattern})")[0]
+        niche = found.groupby(level=0).nunique().reindex(channels.index, fill_value=0)
+    age_days = (now - pd.to_datetime(channels["created_at"], utc=True)).dt.total_seconds().to_numpy() / 86400
+    upload_days = (now - pd.to_datetime(channels["last_upload"], utc=True)).dt.total_seconds() / 86400
+    return channels.assign(
+        ratio=_safe_ratio(channels["views_total"], channels["subscribers"]).round(2),
+        views_per_video=_safe_ratio(channels["views_total"], channels["video_count"]).round(1),
+        subs_per_day=_safe_ratio(channels["subscribers"], np.fmax(np.nan_to_num(age_days), 1)).round(2),
+        days_since_upload=upload_days.clip(lower=0).round(1),
+        faceless=text.str.contains(FACELESS_PATTERN),
+        niche=niche / len(terms) if terms else 0.0,
+    )
+
+
+def score(df, weights=None):
+    """Puntuación 0-1: media ponderada de los percentiles de cada señal entre los candidatos.
+
+    Con percentiles, las señales de escalas muy distintas (ratio, suscriptores/día,
+    días) pesan lo que dice `weights` y un valor extremo no aplasta al resto.
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    total = sum(weights.values()) or 1.0
+    signals = {
+        "ratio": df["ratio"].rank(pct=True),
+        "views_per_video": df["views_per_video"].rank(pct=True),
+        "growth": df["subs_per_day"].rank(pct=True),
+        "recency": df["days_since_upload"].rank(pct=True, ascending=False),
+        "faceless": df["faceless"].astype("float64"),
+        "niche": df["niche"].astype("float64"),
+    }
+    result = sum(weights.get(name, 0) * signal.fillna(0) for name, signal in signals.items())
+    return (result / total).round(3)
+
+
+def rank_channels(channels, max_subs, max_views, keyword="", weights=None, top_k=None, now=None):
+    """Canales que cumplen los filtros, con sus señales y `score`, de mayor a menor (los `top_k` mejores)."""
+    channels = channels[(channels["subscribers"] <= max_subs) & (channels["views_total"] <= max_views)]
+    df = features(channels, keyword, now)
+    df = df.assign(score=score(df, weights))
+    if top_k is not None and top_k < len(df):
+        return df.nlargest(top_k, "score")  # selección parcial, sin ordenar todo
+    return df.sort_values("score", ascending=False)
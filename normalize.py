@@ -0,0 +1,76 @@
+"""Normalización de respuestas de la API a DataFrames tipados, en bloque.
+
+Las funciones trabajan sobre la lista completa de items (json_normalize + operaciones
+vectorizadas), con recuentos Int64 (nulos si YouTube oculta el dato), duraciones en
+segundos y categóricas para canal y categoría.
+"""
+import pandas as pd
+
+# P[n]DT[n]H[n]M[n]S (YouTube también devuelve días en vídeos muy largos y directos)
+DURATION_PATTERN = r"^P(?:(?P<d>\d+)D)?(?:T(?:(?P<h>\d+)H)?(?:(?P<m>\d+)M)?(?:(?P<s>\d+)S)?)?$"
+
+VIDEO_COLUMNS = {
+    "id": "video_id",
+    "id.videoId": "video_id",  # resultados de search
+    "snippet.title": "title",
+    "snippet.channelTitle": "channel_title",
+    "snippet.channelId": "channel_id",
+    "snippet.categoryId": "category_id",
+    "snippet.publishedAt": "published_at",
+    "statistics.viewCount": "views",
+    "statistics.likeCount": "likes",
+    "statistics.commentCount": "comments",
+    "contentDetails.duration": "duration",
+}
+COUNT_COLUMNS = ("views", "likes", "comments")
+CATEGORICAL_COLUMNS = ("channel_title", "channel_id", "category_id")
+
+
+def duration_seconds(durations):
+    """Serie de duraciones ISO 8601 -> segundos (Int64; nulo si no se puede interpretar)."""
+    parts = durations.astype("string").str.extract(DURATION_PATTERN).astype("float64")
+    seconds = parts["d"].fillna(0) * 86400 + parts["h"].fillna(0) * 3600 + parts["m"].fillna(0) * 60 + parts["s"].fillna(0)
+    return seconds.where(parts.notna().any(axis=1)).astype("Int64")
+
+
+def format_duration(seconds):
+    """Segundos -> "h:mm:ss" o "m:ss", como se mostraba antes en las tablas."""
+    h, rem = seconds // 3600, seconds % 3600
+    m, s = rem // 60, rem % 60
+    mm, ss = m.astype("string").str.zfill(2), s.astype("string").str.zfill(2)
+    long_fmt = h.astype("string") + ":" + mm + ":" + ss
+    short_fmt = m.astype("string") + ":" + ss
+    return long_fmt.where(h > 0, short_fmt)
+
+
+def category_index(category_items):
+    """Índice inverso {category_id: título} a partir de los items de videoCategories."""
+    return {c["id"]: c["snippet"]["title"] for c in category_items}
+
+
+def videos_frame(items):
+    """Items de videos.list o search.list -> DataFrame con columnas tipadas."""
+    raw = pd.json_normalize(items)
+    df = pd.DataFrame(index=raw.index)
+    for src, dst in VIDEO_COLUMNS.items():
+        if src in raw and dst not in df:
+            df[dst] = raw[src]
+    has_stats = any(c.startswith("statistics.") for c in raw.columns)
+    for col in COUNT_COLUMNS:
+        if col in df or has_stats:
+            # Si ningún vídeo trae el dato (p. ej. likes ocultos) la columna queda a nulos
+            df[col] = pd.to_numeric(df.get(col, pd.Series(index=df.index, dtype="object")), errors="coerce").astype("Int64")
+    if "duration" in df:
+        df["duration_s"] = duration_seconds(df.pop("duration"))
+    if "published_at" in df:
+        df["published_at"] = pd.to_datetime(df["published_at"], utc=True)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def with_categories(df, categories):
+    """Añade "category" (categórica) a partir del índice {id: título}."""
+    df["category"] = df["category_id"].astype("string").map(categories).fillna("Desconocida").astype("category")
+    return df
@@ -0,0 +1,135 @@
+"""Precarga en segundo plano del chart mostPopular y las categorías de cada región.
+
+Tendencias e Ideas de Nicho piden siempre la misma petición por región (50 vídeos con
+los campos que usan entre las dos, ``chart_items``) y recortan en local, así que
+comparten una sola entrada de la caché de respuestas. El ``Prefetcher`` la renueva
+para todas las regiones de ``COUNTRIES`` antes de que caduque, repartiendo las
+peticiones a lo largo del intervalo con jitter y sin pasar de un presupuesto de
+cuota diario propio.
+
+Dentro de la app arranca con ``services.start_prefetcher``; también puede correr como
+proceso aparte sobre el mismo fichero de caché:
+
+    YOUTUBE_API_KEY=... python prefetch.py --interval 600
+"""
+import argparse
+import datetime
+import os
+import random
+import threading
+import time
+
+from config import COUNTRIES
+from quota import QuotaBudget, QuotaExceeded
+from telemetry import QUOTA_TZ
+from youtube_api import YouTubeClient
+
+CHART_SIZE = 50  # máximo de chart=mostPopular por página
+CHART_PARAMS = {
+    "part": "snippet,statistics,contentDetails",
+    "chart": "mostPopular",
+    "maxResults": CHART_SIZE,
+    "fields": "items(id,snippet(title,channelTitle,channelId,categoryId,publishedAt),"
+              "statistics(viewCount,likeCount),contentDetails/duration)",
+}
+CATEGORY_PARAMS = {"part": "snippet", "fields": "items(id,snippet/title)"}
+
+
+def chart_items(yt, region):
+    """Los 50 vídeos en tendencia de la región (de la caché si está precargada)."""
+    return yt.get("videos", regionCode=region, **CHART_PARAMS).get("items", [])
+
+
+def category_items(yt, region):
+    return yt.get("videoCategories", regionCode=region, **CATEGORY_PARAMS).get("items", [])
+
+
+class Prefetcher:
+    """Hilo que renueva chart y categorías de `regions` cada `interval` segundos.
+
+    Usa su propio cliente (misma caché que la app) con un ``QuotaBudget`` que se
+    renueva cada día de cuota (medianoche del Pacífico, como la API): al agotarlo deja de precargar hasta el día siguiente y las
+    vistas vuelven a pedir bajo demanda.
+    """
+
+    def __init__(self, yt, regions=None, interval=600, daily_quota=1500):
+        self.app_client = yt
+        self.regions = list(regions or COUNTRIES.values())
+        self.interval = interval
+        self.daily_quota = daily_quota
+        self._day = None
+        self.yt = None
+        self.cycles = 0
+        self.last_error = None
+        self._stop = threading.Event()
+
+    def _budget_for_today(self):
+        day = datetime.datetime.now(QUOTA_TZ).date()
+        if day != self._day:
+            self._day = day
+            app = self.app_client
+            self.yt = YouTubeClient(app.api_key, app.base_url, cache=app.cache, budget=QuotaBudget(self.daily_quota))
+        return self.yt.budget
+
+    def refresh_region(self, region):
+        # Las categorías casi no cambian: basta con que estén en caché (TTL de días)
+        category_items(self.yt, region)
+        self.yt.refresh("videos", regionCode=region, **CHART_PARAMS)
+
+    def run_cycle(self):
+        """Una pasada por todas las regiones, repartida a lo largo del intervalo.
+
+        El orden es siempre el mismo: cada región se renueva cada `interval` segundos
+        (más o menos el jitter), por debajo del TTL del chart.
+        """
+        step = self.interval / len(self.regions)
+        for region in self.regions:
+            budget = self._budget_for_today()
+            try:
+                self.refresh_region(region)
+            except QuotaExceeded as e:
+                self.last_error = str(e)
+            except Exception as e:  # red caída, 5xx...: se reintenta en la próxima pasada
+                self.last_error = f"{region}: {e}"
+            if budget.remaining <= 0 or self._stop.wait(step * random.uniform(0.8, 1.2)):
+                return
+        self.cycles += 1
+
+    def run(self):
+        # Desfase inicial aleatorio: varios procesos arrancados a la vez no piden a la par
+        self._stop.wait(random.uniform(0, min(self.interval, 10)))
+        while not self._stop.is_set():
+            self.run_cycle()
+            if self._budget_for_today().remaining <= 0:
+                self._stop.wait(self.interval)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True, name="prefetch").start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=int, default=600, help="segundos por pasada (menos que el TTL del chart)")
+    parser.add_argument("--quota", type=int, default=1500, help="unidades de cuota al día para la precarga")
+    parser.add_argument("--regions", nargs="*", help="códigos de región (por defecto, todos los de COUNTRIES)")
+    args = parser.parse_args()
+
+    from api_cache import ResponseCache
+
+    yt = YouTubeClient(os.environ["YOUTUBE_API_KEY"], cache=ResponseCache())
+    prefetcher = Prefetcher(yt, args.regions, args.interval, args.quota)
+    while True:
+        prefetcher.run_cycle()
+        print(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} pasada {prefetcher.cycles}; "
+              f"cuota del día {prefetcher.yt.budget.used}/{args.quota}"
+              + (f"; último error: {prefetcher.last_error}" if prefetcher.last_error else ""))
+        if prefetcher.yt.budget.remaining <= 0:
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
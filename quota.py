@@ -0,0 +1,56 @@
+"""Coste en cuota de la YouTube Data API y presupuesto compartido para lotes."""
+import threading
+
+# Unidades por llamada de lectura (YouTube Data API v3)
+QUOTA_COSTS = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "videoCategories": 1,
+    "playlistItems": 1,
+}
+DEFAULT_COST = 1
+
+
+def cost_of(endpoint):
+    return QUOTA_COSTS.get(endpoint, DEFAULT_COST)
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class QuotaBudget:
+    """Presupuesto de cuota compartido entre hilos; cada llamada real a la API lo descuenta."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def charge(self, endpoint):
+        cost = cost_of(endpoint)
+        with self._lock:
+            if self.used + cost > self.limit:
+                raise QuotaExceeded(f"Presupuesto de cuota agotado ({self.used}/{self.limit} unidades)")
+            self.used += cost
+
+    def reserve(self, units):
+        """Aparta `units` de golpe y las devuelve como un presupuesto propio para un trabajo.
+
+        Lo que el trabajo no gaste vuelve al presupuesto con `release`.
+        """
+        with self._lock:
+            if self.used + units > self.limit:
+                raise QuotaExceeded(f"Presupuesto de cuota insuficiente ({self.used}/{self.limit} unidades, "
+                                    f"se necesitan {units})")
+            self.used += units
+        return QuotaBudget(units)
+
+    def release(self, reservation):
+        with self._lock:
+            self.used -= reservation.remaining
+
+    @property
+    def remaining(self):
+        return self.limit - self.used
@@ -0,0 +1,62 @@
+import streamlit as st
+
+import singleflight
+import telemetry
+from api_cache import ResponseCache
+from config import (
+    CLOUD_RUN_URL, METRICS_PORT, PREFETCH_INTERVAL, PREFETCH_QUOTA, TRENDS_CACHE_PATH, TRENDS_REQUESTS_PER_MINUTE
+)
+from prefetch import Prefetcher
+from trends import TrendsService
+from upload_jobs import UploadJobManager
+from youtube_api import TIMEOUTS, YouTubeClient, http_request
+
+
+@st.cache_resource
+def get_yt_client():
+    # Un único cliente (pool de conexiones + caché en disco) compartido por todas las sesiones
+    return YouTubeClient(st.secrets["YOUTUBE_API_KEY"], cache=ResponseCache())
+
+
+def _list_channels():
+    r = http_request(
+        "GET", f"{CLOUD_RUN_URL}/list_channels", timeout=TIMEOUTS["cloud_run"], metric=("cloud_run", "list_channels")
+    )
+    r.raise_for_status()
+    return r.json()  # dict {alias: {...}}
+
+
+@st.cache_data(ttl=60)
+def fetch_channels():
+    try:
+        # Varias sesiones con la caché caducada comparten una sola llamada a Cloud Run
+        return singleflight.do(("cloud_run", "list_channels"), _list_channels)
+    except Exception as e:
+        st.error(f"No se pudo conectar con el servicio: {e}")
+        return {}
+
+
+@st.cache_resource
+def get_trends_service():
+    # Un único limitador y cliente de pytrends para todas las sesiones: Google limita por IP
+    return TrendsService(ResponseCache(TRENDS_CACHE_PATH), requests_per_minute=TRENDS_REQUESTS_PER_MINUTE)
+
+
+@st.cache_resource
+def get_upload_jobs():
+    # Cola de subidas única por proceso; al crearla se reanudan los trabajos pendientes
+    return UploadJobManager(CLOUD_RUN_URL)
+
+
+@st.cache_resource
+def start_metrics_endpoint():
+    # Un único servidor /metrics por proceso, solo si METRICS_PORT está definido
+    return telemetry.serve_metrics(METRICS_PORT) if METRICS_PORT else None
+
+
+@st.cache_resource
+def start_prefetcher():
+    # Un único hilo de precarga por proceso, sobre la caché del cliente compartido
+    if PREFETCH_INTERVAL <= 0:
+        return None
+    return Prefetcher(get_yt_client(), interval=PREFETCH_INTERVAL, daily_quota=PREFETCH_QUOTA).start()
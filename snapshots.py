@@ -0,0 +1,181 @@
+"""Histórico de tendencias: snapshots de chart=mostPopular en Parquet particionado.
+
+Estructura en disco (append-only, particiones estilo Hive):
+
+    data/trending/region=MX/date=2026-10-18/070000_0.parquet
+
+Uso como job sin interfaz (p. ej. desde cron o un contenedor aparte):
+
+    YOUTUBE_API_KEY=... python snapshots.py --once
+    YOUTUBE_API_KEY=... python snapshots.py --interval 3600 --categories
+"""
+import argparse
+import datetime
+import glob
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import COUNTRIES
+from normalize import videos_frame
+
+SNAPSHOT_DIR = os.environ.get("TRENDING_SNAPSHOT_DIR", os.path.join("data", "trending"))
+
+# "0" = chart general (sin categoría)
+GENERAL_CHART = "0"
+
+SNAPSHOT_FIELDS = (
+    "items(id,snippet(title,channelTitle,channelId,categoryId,publishedAt),"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+
+PARTITIONING = ds.partitioning(pa.schema([("region", pa.string()), ("date", pa.string())]), flavor="hive")
+
+SCHEMA = pa.schema([
+    ("snapshot_ts", pa.timestamp("s", tz="UTC")),
+    ("chart", pa.dictionary(pa.int8(), pa.string())),
+    ("rank", pa.int16()),
+    ("video_id", pa.string()),
+    ("title", pa.string()),
+    ("channel_id", pa.dictionary(pa.int32(), pa.string())),
+    ("channel_title", pa.dictionary(pa.int32(), pa.string())),
+    ("category_id", pa.dictionary(pa.int8(), pa.string())),
+    ("published_at", pa.timestamp("s", tz="UTC")),
+    ("views", pa.int64()),
+    ("likes", pa.int64()),
+    ("comments", pa.int64()),
+])
+
+
+def fetch_snapshot(yt, region, category_id=None, snapshot_ts=None):
+    """Descarga el chart mostPopular (50 vídeos) de una región como DataFrame."""
+    snapshot_ts = snapshot_ts or datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    res = yt.get(
+        "videos", part="snippet,statistics", chart="mostPopular", regionCode=region,
+        videoCategoryId=category_id, maxResults=50, fields=SNAPSHOT_FIELDS
+    )
+    df = videos_frame(res.get("items", []))
+    if df.empty:
+        return df
+    df.insert(0, "snapshot_ts", pd.Timestamp(snapshot_ts))
+    df.insert(1, "chart", category_id or GENERAL_CHART)
+    df.insert(2, "rank", range(1, len(df) + 1))
+    return df[SCHEMA.names]
+
+
+def write_snapshot(df, region, root=SNAPSHOT_DIR):
+    """Añade un snapshot a la partición region=/date= correspondiente."""
+    if df.empty:
+        return None
+    ts = df["snapshot_ts"].iloc[0]
+    part_dir = os.path.join(root, f"region={region}", f"date={ts:%Y-%m-%d}")
+    os.makedirs(part_dir, exist_ok=True)
+    # Un fichero por (hora, chart): nunca se reescribe nada existente
+    path = os.path.join(part_dir, f"{ts:%H%M%S}_{df['chart'].iloc[0]}.parquet")
+    table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+    pq.write_table(table, path, compression="zstd")
+    return path
+
+
+def ingest(yt, regions=None, categories=False, root=SNAPSHOT_DIR):
+    """Un ciclo de ingesta: chart general (y opcionalmente por categoría) de cada región."""
+    snapshot_ts = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    written = []
+    for region in regions or COUNTRIES.values():
+        charts = [None]
+        if categories:
+            cats = yt.get("videoCategories", part="snippet", regionCode=region, fields="items(id,snippet/assignable)")
+            charts += [c["id"] for c in cats.get("items", []) if c["snippet"].get("assignable")]
+        for category_id in charts:
+            path = write_snapshot(fetch_snapshot(yt, region, category_id, snapshot_ts), region, root)
+            if path:
+                written.append(path)
+    return written
+
+
+def snapshot_files(region, root=SNAPSHOT_DIR, chart=GENERAL_CHART):
+    """Ficheros de snapshot de una región y un chart, en orden cronológico."""
+    return sorted(glob.glob(os.path.join(root, f"region={region}", "date=*", f"*_{chart}.parquet")))
+
+
+def load_history(root=SNAPSHOT_DIR, regions=None, start=None, end=None, charts=(GENERAL_CHART,), columns=None):
+    """Lee el histórico con filtros empujados al escaneo (poda de particiones + filtros de fila)."""
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=SCHEMA.names + ["region", "date"])
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    flt = None
+    conditions = []
+    if regions:
+        conditions.append(ds.field("region").isin(list(regions)))
+    if start:
+        conditions.append(ds.field("date") >= f"{start:%Y-%m-%d}")
+    if end:
+        conditions.append(ds.field("date") <= f"{end:%Y-%m-%d}")
+    if charts:
+        conditions.append(ds.field("chart").isin(list(charts)))
+    for cond in conditions:
+        flt = cond if flt is None else flt & cond
+    df = dataset.to_table(columns=columns, filter=flt).to_pandas()
+    if "region" in df:
+        df["region"] = df["region"].astype("category")
+    for col in ("likes", "comments"):
+        if col in df:
+            df[col] = df[col].astype("Int64")  # ocultos en algunos vídeos: nulos, no 0
+    return df
+
+
+def trending_metrics(history):
+    """Métricas por vídeo y región: tiempo en tendencias, velocidad de vistas/likes y movimiento de rank."""
+    if history.empty:
+        return pd.DataFrame()
+    h = history.sort_values("snapshot_ts")
+    out = h.groupby(["region", "video_id"], observed=True).agg(
+        title=("title", "last"),
+        channel=("channel_title", "last"),
+        first_seen=("snapshot_ts", "min"),
+        last_seen=("snapshot_ts", "max"),
+        snapshots=("snapshot_ts", "size"),
+        best_rank=("rank", "min"),
+        first_rank=("rank", "first"),
+        last_rank=("rank", "last"),
+        first_views=("views", "first"),
+        last_views=("views", "last"),
+        first_likes=("likes", "first"),
+        last_likes=("likes", "last"),
+    ).reset_index()
+    hours = (out["last_seen"] - out["first_seen"]).dt.total_seconds() / 3600
+    hours = hours.where(hours > 0)
+    out["hours_trending"] = hours.fillna(0).round(1)
+    out["views_per_hour"] = ((out["last_views"] - out["first_views"]) / hours).round(1)
+    out["likes_per_hour"] = ((out["last_likes"] - out["first_likes"]) / hours).round(1)
+    out["rank_change"] = (out["first_rank"] - out["last_rank"]).astype("int16")  # >0: ha subido
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="un único ciclo y salir")
+    parser.add_argument("--interval", type=int, default=3600, help="segundos entre ciclos")
+    parser.add_argument("--categories", action="store_true", help="también el chart de cada categoría")
+    parser.add_argument("--regions", nargs="*", help="códigos de región (por defecto, todos los de COUNTRIES)")
+    parser.add_argument("--root", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    from youtube_api import YouTubeClient
+
+    # Sin caché: cada ciclo debe ver el chart actual
+    yt = YouTubeClient(os.environ["YOUTUBE_API_KEY"])
+    while True:
+        written = ingest(yt, args.regions, args.categories, args.root)
+        print(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {len(written)} snapshots escritos")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Instrumentación de las llamadas salientes (YouTube, pytrends, Cloud Run).
+
+Cada llamada real registra endpoint, latencia, tamaño de la respuesta, estado y coste en
+cuota; las consultas a la caché de respuestas registran acierto/fallo. Los datos se
+agregan por proceso (``PROCESS``) y por sesión de Streamlit (la ``Stats`` enlazada con
+``bind_session`` en el contexto actual). Con ``TELEMETRY_LOG`` cada evento se añade
+además como una línea JSON a ese fichero.
+"""
+import collections
+import contextvars
+import datetime
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+from quota import cost_of
+
+LOG_PATH = os.environ.get("TELEMETRY_LOG")
+RECENT_EVENTS = 500
+
+# La cuota diaria de la YouTube Data API se renueva a medianoche, hora del Pacífico
+QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+
+_FIELDS = ("calls", "errors", "cache_hits", "cache_misses", "latency_total", "latency_max", "bytes", "quota")
+
+
+class Stats:
+    """Contadores por (servicio, endpoint) y los últimos eventos, protegidos por un lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self.events = collections.deque(maxlen=RECENT_EVENTS)
+
+    def _row(self, service, endpoint):
+        key = (service, endpoint)
+        if key not in self._rows:
+            self._rows[key] = dict.fromkeys(_FIELDS, 0)
+        return self._rows[key]
+
+    def add(self, event):
+        with self._lock:
+            row = self._row(event["service"], event["endpoint"])
+            if event["kind"] == "cache":
+                row["cache_hits" if event["hit"] else "cache_misses"] += 1
+            else:
+                row["calls"] += 1
+                row["errors"] += event["error"]
+                row["latency_total"] += event["latency"]
+                row["latency_max"] = max(row["latency_max"], event["latency"])
+                row["bytes"] += event["bytes"]
+                row["quota"] += event["quota"]
+            self.events.append(event)
+
+    def rows(self):
+        """Lista de dicts (uno por servicio y endpoint) con los contadores acumulados."""
+        with self._lock:
+            return [dict(service=s, endpoint=e, **row) for (s, e), row in sorted(self._rows.items())]
+
+    def quota_used(self):
+        with self._lock:
+            return sum(row["quota"] for row in self._rows.values())
+
+    def jsonl(self):
+        with self._lock:
+            return "".join(json.dumps(e) + "\n" for e in self.events)
+
+
+class DailyQuota:
+    """Unidades de cuota gastadas por el proceso en el día de cuota actual (se pone a cero al cambiar)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._day = None
+        self._used = 0
+
+    def _roll(self):
+        day = datetime.datetime.now(QUOTA_TZ).date()
+        if day != self._day:
+            self._day, self._used = day, 0
+
+    def add(self, units):
+        with self._lock:
+            self._roll()
+            self._used += units
+
+    def used(self):
+        with self._lock:
+            self._roll()
+            return self._used
+
+
+# Agregado de todo el proceso (todas las sesiones y los hilos en segundo plano)
+PROCESS = Stats()
+# Cuota del día para el presupuesto diario (QUOTA_BUDGET); PROCESS acumula desde el arranque
+QUOTA_TODAY = DailyQuota()
+
+_session = contextvars.ContextVar("telemetry_session", default=None)
+_log_lock = threading.Lock()
+
+
+def bind_session(stats):
+    """Atribuye a `stats` los eventos del contexto actual (el hilo del script de la sesión)."""
+    _session.set(stats)
+
+
+def _emit(event):
+    PROCESS.add(event)
+    if event.get("quota"):
+        QUOTA_TODAY.add(event["quota"])
+    session = _session.get()
+    if session is not None:
+        session.add(event)
+    if LOG_PATH:
+        with _log_lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+
+def record_call(service, endpoint, latency, size=0, status=None):
+    """Una llamada de red; `status` None significa que no hubo respuesta (timeout, conexión)."""
+    _emit({
+        "ts": time.time(), "kind": "call", "service": service, "endpoint": endpoint,
+        "latency": round(latency, 4), "bytes": size, "status": status,
+        "error": status is None or status >= 400,
+        # Solo la YouTube Data API cobra cuota; también los errores y los reintentos
+        "quota": cost_of(endpoint) if service == "youtube" else 0,
+    })
+
+
+def record_cache(service, endpoint, hit):
+    _emit({"ts": time.time(), "kind": "cache", "service": service, "endpoint": endpoint, "hit": hit})
+
+
+def prometheus_text(stats=PROCESS):
+    """Contadores de `stats` en el formato de texto de Prometheus."""
+    metrics = [
+        ("yt_app_calls_total", "counter", "Llamadas salientes", "calls"),
+        ("yt_app_call_errors_total", "counter", "Llamadas sin respuesta o con estado >= 400", "errors"),
+        ("yt_app_call_latency_seconds_sum", "counter", "Latencia acumulada", "latency_total"),
+        ("yt_app_call_latency_seconds_max", "gauge", "Latencia máxima", "latency_max"),
+        ("yt_app_response_bytes_total", "counter", "Bytes de respuesta", "bytes"),
+        ("yt_app_quota_units_total", "counter", "Unidades de cuota de la YouTube Data API", "quota"),
+        ("yt_app_cache_hits_total", "counter", "Aciertos de la caché de respuestas", "cache_hits"),
+        ("yt_app_cache_misses_total", "counter", "Fallos de la caché de respuestas", "cache_misses"),
+    ]
+    rows = stats.rows()
+    lines = []
+    for name, kind, help_text, field in metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for row in rows:
+            lines.append(f'{name}{{service="{row["service"]}",endpoint="{row["endpoint"]}"}} {row[field]}')
+    return "\n".join(lines) + "\n"
+
+
+def serve_metrics(port, host="0.0.0.0"):
+    """Sirve ``prometheus_text()`` en http://host:port/metrics desde un hilo en segundo plano."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    return server
@@ -0,0 +1,44 @@
+"""Peticiones a channels.list del escaneo de Nicho, contadas contra el servidor simulado."""
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+from mock_api import make_server  # noqa: E402
+from niche_pipeline import CHANNELS_BATCH_SIZE, iter_niche  # noqa: E402
+from youtube_api import YouTubeClient  # noqa: E402
+
+# El corpus sintético asigna el vídeo i al canal i % (VIDEOS // 2): cada canal aparece dos veces
+VIDEOS = 240
+UNIQUE_CHANNELS = VIDEOS // 2
+
+
+@pytest.fixture
+def mock():
+    server, state = make_server(VIDEOS)
+    yield server, state
+    server.shutdown()
+
+
+@pytest.mark.parametrize("page_size", [None, VIDEOS], ids=["paginas-de-50", "una-pagina"])
+def test_channels_batched_by_50_without_duplicates(mock, page_size):
+    server, state = mock
+    state["config"]["page_size"] = page_size
+    yt = YouTubeClient("test", base_url=f"http://127.0.0.1:{server.server_port}")
+
+    channels, videos = {}, 0
+    for kind, payload in iter_niche(yt, VIDEOS, part="snippet", q="test"):
+        if kind == "videos":
+            videos += len(payload)
+        else:
+            assert not channels.keys() & payload.keys(), "canal pedido dos veces"
+            channels.update(payload)
+
+    assert videos == VIDEOS
+    assert len(channels) == UNIQUE_CHANNELS > CHANNELS_BATCH_SIZE
+    assert state["by_endpoint"]["channels"] == math.ceil(UNIQUE_CHANNELS / CHANNELS_BATCH_SIZE)
@@ -0,0 +1,231 @@
+"""Acceso a Google Trends (pytrends) compartido por todas las sesiones.
+
+Google limita el acceso sin avisar de cuánto, así que todas las llamadas pasan por un
+único cliente con un limitador de tipo token bucket y reintentos con espera
+exponencial, y los resultados se guardan en una caché en disco (SQLite) por
+(palabras clave, periodo, región). Se piden hasta 5 palabras clave por payload, el
+máximo de Trends: ``related_queries`` de varias palabras comparte el payload y las
+comparaciones reutilizan lo ya descargado.
+"""
+import io
+import random
+import threading
+import time
+
+import pandas as pd
+
+import singleflight
+import telemetry
+from api_cache import make_key
+
+MAX_KEYWORDS = 5  # palabras clave por payload que admite Google Trends
+MAX_RETRIES = 3
+BACKOFF = 2.0  # segundos de la primera espera tras un fallo
+COOLDOWN = 60  # segundos sin llamar a Google tras un 429
+FAILURE_TTL = 120  # los fallos también se guardan, poco tiempo: nadie repite el ciclo de reintentos
+FAILED = {"failed": True}
+
+# Periodos cortos cambian rápido; el resto apenas se mueve en horas
+TIMEFRAME_TTLS = {"now 1-H": 5 * 60, "now 4-H": 10 * 60, "now 1-d": 30 * 60, "now 7-d": 3600}
+DEFAULT_TTL = 12 * 3600
+
+
+def ttl_for(timeframe):
+    return TIMEFRAME_TTLS.get(timeframe, DEFAULT_TTL)
+
+
+class TokenBucket:
+    """Limitador: `capacity` llamadas seguidas como mucho y luego `rate` por segundo."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Espera hasta que haya un token libre y lo consume."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _frame_to_json(df):
+    return df.to_json(orient="split", date_format="iso")
+
+
+def _frame_from_json(text):
+    df = pd.read_json(io.StringIO(text), orient="split")
+    if len(df.index):
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "date"
+    return df
+
+
+def _related_to_json(related):
+    return {kind: None if df is None else df.to_dict(orient="records") for kind, df in related.items()}
+
+
+def _related_from_json(data):
+    return {kind: None if rows is None else pd.DataFrame(rows) for kind, rows in data.items()}
+
+
+def _failed(value):
+    return isinstance(value, dict) and value.get("failed") is True
+
+
+def _interest_from_cache(value):
+    return None if _failed(value) else _frame_from_json(value)
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class TrendsService:
+    """Cliente de pytrends con limitador, reintentos y caché (``ResponseCache``) opcional.
+
+    Un solo ``TrendReq`` (con sus cookies) para todo el proceso; como guarda el payload
+    actual, las llamadas se serializan con un lock.
+    """
+
+    def __init__(self, cache=None, requests_per_minute=10, burst=5, hl="es-ES"):
+        self.cache = cache
+        self.bucket = TokenBucket(requests_per_minute / 60, burst)
+        self.hl = hl
+        self._client = None
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0  # time.monotonic() hasta el que no se llama a Google tras un 429
+
+    def _call(self, endpoint, fn, *args, **kwargs):
+        """`fn` tras pasar por el limitador, registrando la llamada en telemetry."""
+        self.bucket.acquire()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            # ResponseError de pytrends lleva la respuesta (429 si Google está limitando)
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            telemetry.record_call("pytrends", endpoint, time.perf_counter() - start, status=status)
+            e.status = status
+            raise
+        telemetry.record_call("pytrends", endpoint, time.perf_counter() - start, status=200)
+        return result
+
+    def _trendreq(self):
+        if self._client is None:
+            # pytrends es pesado: solo se importa cuando se usa
+            from pytrends.request import TrendReq
+
+            self._client = self._call("cookies", TrendReq, hl=self.hl, tz=0)
+        return self._client
+
+    def _fetch(self, keywords, timeframe, geo, gprop, endpoints):
+        """Un payload con `keywords` y las llamadas de `endpoints`; None en las que fallen.
+
+        Los fallos pasajeros se reintentan con espera exponencial, siempre fuera del lock
+        para no bloquear al resto de sesiones. Un 429 no se reintenta: abre una pausa de
+        COOLDOWN segundos para todo el proceso. Los fallos se guardan en caché FAILURE_TTL.
+        """
+        results = dict.fromkeys(endpoints)
+        for attempt in range(MAX_RETRIES + 1):
+            if time.monotonic() < self._cooldown_until:
+                break
+            status = None
+            with self._lock:
+                try:
+                    client = self._trendreq()
+                    self._call("build_payload", client.build_payload, list(keywords), cat=0,
+                               timeframe=timeframe, geo=geo, gprop=gprop)
+                    for endpoint in endpoints:
+                        if results[endpoint] is None:
+                            results[endpoint] = self._call(endpoint, getattr(client, endpoint))
+                except Exception as e:
+                    status = getattr(e, "status", None)
+                else:
+                    break
+            if status == 429:
+                self._cooldown_until = time.monotonic() + COOLDOWN
+                break
+            if attempt < MAX_RETRIES:
+                time.sleep(BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+        self._store(keywords, timeframe, geo, gprop, results)
+        return results
+
+    def _key(self, endpoint, keywords, timeframe, geo, gprop):
+        # El interés es relativo al máximo del grupo: la clave es el grupo entero (sin orden)
+        return make_key(endpoint, {"q": ",".join(sorted(keywords)), "timeframe": timeframe, "geo": geo,
+                                   "gprop": gprop})
+
+    def _cached(self, endpoint, keywords, timeframe, geo, gprop):
+        if self.cache is None:
+            return None
+        value = self.cache.get(self._key(endpoint, keywords, timeframe, geo, gprop))
+        telemetry.record_cache("pytrends", endpoint, value is not None)
+        return value
+
+    def _store(self, keywords, timeframe, geo, gprop, results):
+        if self.cache is None:
+            return
+        ttl = ttl_for(timeframe)
+        if "interest_over_time" in results:
+            interest = results["interest_over_time"]
+            self.cache.set(self._key("interest_over_time", keywords, timeframe, geo, gprop),
+                           FAILED if interest is None else _frame_to_json(interest),
+                           FAILURE_TTL if interest is None else ttl)
+        if "related_queries" in results:
+            # Las consultas relacionadas son independientes por palabra: se guardan una a una
+            related = results["related_queries"] or {}
+            for kw in keywords:
+                value = _related_to_json(related[kw]) if kw in related else FAILED
+                self.cache.set(self._key("related_queries", [kw], timeframe, geo, gprop), value,
+                               ttl if kw in related else FAILURE_TTL)
+
+    def _load(self, keywords, timeframe, geo, gprop, endpoints):
+        return singleflight.do(("pytrends", tuple(keywords), timeframe, geo, gprop, endpoints),
+                               self._fetch, keywords, timeframe, geo, gprop, endpoints)
+
+    def interest_over_time(self, keywords, timeframe, geo="", gprop="youtube"):
+        """Interés de hasta 5 palabras clave (relativo al máximo del grupo); None si Google lo rechazó."""
+        keywords = list(dict.fromkeys(keywords))[:MAX_KEYWORDS]
+        cached = self._cached("interest_over_time", keywords, timeframe, geo, gprop)
+        if cached is not None:
+            return _interest_from_cache(cached)
+        return self._load(keywords, timeframe, geo, gprop, ("interest_over_time",))["interest_over_time"]
+
+    def related_queries(self, keywords, timeframe, geo="", gprop="youtube"):
+        """{palabra: {"top": DataFrame|None, "rising": DataFrame|None}}, sin las que fallaron.
+
+        Las que no están en caché se piden en grupos de 5 por payload.
+        """
+        found, missing = {}, []
+        for kw in dict.fromkeys(keywords):
+            cached = self._cached("related_queries", [kw], timeframe, geo, gprop)
+            if cached is None:
+                missing.append(kw)
+            elif not _failed(cached):
+                found[kw] = _related_from_json(cached)
+        for batch in _chunks(missing, MAX_KEYWORDS):
+            found.update(self._load(batch, timeframe, geo, gprop, ("related_queries",))["related_queries"] or {})
+        return found
+
+    def fetch_trends(self, keyword, timeframe, geo="", gprop="youtube"):
+        """(interest_over_time, related_queries) de una palabra clave, con un solo payload si falta todo."""
+        interest = self._cached("interest_over_time", [keyword], timeframe, geo, gprop)
+        related = self._cached("related_queries", [keyword], timeframe, geo, gprop)
+        endpoints = tuple(name for name, value in (("interest_over_time", interest), ("related_queries", related))
+                          if value is None)
+        results = self._load([keyword], timeframe, geo, gprop, endpoints) if endpoints else {}
+        if interest is not None:
+            results["interest_over_time"] = _interest_from_cache(interest)
+        if related is not None:
+            results["related_queries"] = {} if _failed(related) else {keyword: _related_from_json(related)}
+        return results["interest_over_time"], results["related_queries"] or {}
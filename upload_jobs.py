@@ -0,0 +1,216 @@
+"""Cola de subidas en segundo plano: GCS + Cloud Run fuera del hilo del script de Streamlit.
+
+Cada trabajo guarda su estado en SQLite y su vídeo en disco, así que sobrevive a
+reruns, recargas del navegador y reinicios del proceso. Un despachador lanza
+trabajos respetando un máximo global de hilos y un máximo por canal (alias).
+Los trabajos terminados (y el vídeo de los fallidos, que se guarda para poder
+reintentar) se borran pasados UPLOAD_JOB_RETENTION_DAYS días.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+
+from gcs_upload import UploadError, upload_file
+from youtube_api import TIMEOUTS, http_request
+
+DEFAULT_JOBS_DIR = os.environ.get("UPLOAD_JOBS_DIR", os.path.join(".cache", "upload_jobs"))
+MAX_WORKERS = int(os.environ.get("UPLOAD_MAX_WORKERS", "4"))
+MAX_PER_CHANNEL = int(os.environ.get("UPLOAD_MAX_PER_CHANNEL", "1"))
+JOB_RETENTION_DAYS = float(os.environ.get("UPLOAD_JOB_RETENTION_DAYS", "7"))
+YOUTUBE_UPLOAD_TIMEOUT = (10, 1800)  # hasta 30 min
+
+QUEUED, UPLOADING_GCS, UPLOADING_YOUTUBE, DONE, ERROR = "queued", "uploading_gcs", "uploading_youtube", "done", "error"
+ACTIVE_STATES = (QUEUED, UPLOADING_GCS, UPLOADING_YOUTUBE)
+
+STATUS_LABELS = {
+    QUEUED: "⏳ En cola",
+    UPLOADING_GCS: "☁️ Subiendo a GCS",
+    UPLOADING_YOUTUBE: "📤 Subiendo a YouTube",
+    DONE: "✅ Subido",
+    ERROR: "❌ Error",
+}
+
+_COLUMNS = ("id", "alias", "title", "status", "progress", "message", "url", "video_id",
+            "metadata", "created_at", "updated_at")
+
+
+class UploadJobManager:
+    def __init__(self, cloud_run_url, jobs_dir=DEFAULT_JOBS_DIR, max_workers=MAX_WORKERS,
+                 max_per_channel=MAX_PER_CHANNEL):
+        self.cloud_run_url = cloud_run_url.rstrip("/")
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        self.max_per_channel = max_per_channel
+        self._lock = threading.Lock()
+        self._running = {}  # job_id -> alias
+        os.makedirs(os.path.join(jobs_dir, "files"), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(jobs_dir, "jobs.sqlite"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, alias TEXT NOT NULL, title TEXT, status TEXT NOT NULL,"
+            " progress REAL NOT NULL DEFAULT 0, message TEXT, url TEXT, video_id TEXT,"
+            " metadata TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_alias_created ON jobs (alias, created_at)")
+        self._conn.commit()
+        self._recover()
+
+    # --- Persistencia ---
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        cols = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {cols} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def _rows(self, where="", params=(), order="ORDER BY created_at"):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs {where} {order}", params
+            ).fetchall()
+        jobs = [dict(zip(_COLUMNS, row)) for row in rows]
+        for job in jobs:
+            job["metadata"] = json.loads(job["metadata"])
+        return jobs
+
+    def _file_path(self, job_id):
+        return os.path.join(self.jobs_dir, "files", job_id)
+
+    def _prune(self):
+        """Borra los trabajos terminados hace más de JOB_RETENTION_DAYS y sus vídeos (los fallidos lo conservan)."""
+        cutoff = time.time() - JOB_RETENTION_DAYS * 86400
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, ERROR, cutoff)
+            )]
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in ids])
+            self._conn.commit()
+        for job_id in ids:
+            if os.path.exists(self._file_path(job_id)):
+                os.remove(self._file_path(job_id))
+
+    def _recover(self):
+        """Tras un reinicio: los trabajos a medias en GCS vuelven a la cola.
+
+        Los que ya estaban en el paso de YouTube no se relanzan: Cloud Run pudo
+        completarlos y repetir el POST duplicaría el vídeo.
+        """
+        for job in self._rows("WHERE status IN (?, ?)", (QUEUED, UPLOADING_GCS)):
+            self._update(job["id"], status=QUEUED, progress=0, message="Reanudado tras reinicio")
+        for job in self._rows("WHERE status = ?", (UPLOADING_YOUTUBE,)):
+            self._update(job["id"], status=ERROR,
+                         message="Interrumpido durante la subida a YouTube; revisa el canal antes de reintentar")
+        self._prune()
+        self._dispatch()
+
+    # --- API pública ---
+
+    def submit(self, alias, fileobj, metadata):
+        """Guarda el vídeo en disco, encola el trabajo y devuelve su id."""
+        job_id = uuid.uuid4().hex
+        fileobj.seek(0)
+        with open(self._file_path(job_id), "wb") as f:
+            shutil.copyfileobj(fileobj, f, 8 * 1024 * 1024)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, alias, title, status, metadata, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, alias, metadata.get("title"), QUEUED, json.dumps(metadata), now, now),
+            )
+            self._conn.commit()
+        self._prune()
+        self._dispatch()
+        return job_id
+
+    def retry(self, job_id):
+        """Vuelve a encolar un trabajo fallido (su vídeo sigue en disco)."""
+        if os.path.exists(self._file_path(job_id)):
+            self._update(job_id, status=QUEUED, progress=0, message="Reintentando…")
+            self._dispatch()
+
+    def get(self, job_ids):
+        if not job_ids:
+            return []
+        return self._rows(f"WHERE id IN ({', '.join('?' * len(job_ids))})", tuple(job_ids))
+
+    def recent(self, alias=None, limit=50):
+        """Los últimos `limit` trabajos (de un canal, si se indica), en orden de creación."""
+        where, params = ("", ()) if alias is None else ("WHERE alias = ?", (alias,))
+        return self._rows(where, (*params, limit), "ORDER BY created_at DESC LIMIT ?")[::-1]
+
+    # --- Ejecución ---
+
+    def _dispatch(self):
+        """Arranca trabajos en cola mientras haya hueco global y en su canal."""
+        for job in self._rows("WHERE status = ?", (QUEUED,)):
+            with self._lock:
+                if job["id"] in self._running or len(self._running) >= self.max_workers:
+                    continue
+                if sum(1 for a in self._running.values() if a == job["alias"]) >= self.max_per_channel:
+                    continue
+                # Reclamar el trabajo de forma atómica: otro despachador pudo adelantarse
+                cur = self._conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    (UPLOADING_GCS, time.time(), job["id"], QUEUED),
+                )
+                self._conn.commit()
+                if cur.rowcount != 1:
+                    continue
+                self._running[job["id"]] = job["alias"]
+            threading.Thread(target=self._run, args=(job,), daemon=True, name=f"upload-{job['id'][:8]}").start()
+
+    def _run(self, job):
+        try:
+            self._process(job)
+        except Exception as e:
+            self._update(job["id"], status=ERROR, message=str(e))
+        finally:
+            with self._lock:
+                self._running.pop(job["id"], None)
+            self._dispatch()
+
+    def _process(self, job):
+        job_id, alias, metadata = job["id"], job["alias"], job["metadata"]
+
+        # 1️⃣ URL firmada
+        self._update(job_id, status=UPLOADING_GCS, progress=0, message="Generando URL de subida…")
+        resp = http_request(
+            "GET", f"{self.cloud_run_url}/generate_upload_url/{alias}", timeout=TIMEOUTS["cloud_run"],
+            metric=("cloud_run", "generate_upload_url")
+        )
+        if resp.status_code != 200:
+            raise UploadError(f"Error al generar URL de subida: {resp.text}")
+        upload_info = resp.json()
+
+        # 2️⃣ Vídeo a GCS (progreso guardado como mucho una vez por segundo)
+        last_saved = [0.0]
+
+        def on_progress(sent, total, elapsed):
+            now = time.monotonic()
+            if now - last_saved[0] >= 1 or sent == total:
+                last_saved[0] = now
+                mb_s = sent / elapsed / 1e6 if elapsed > 0 else 0
+                self._update(job_id, progress=sent / total if total else 1.0,
+                             message=f"{sent / 1e6:.1f} / {total / 1e6:.1f} MB · {mb_s:.1f} MB/s")
+
+        with open(self._file_path(job_id), "rb") as f:
+            upload_file(upload_info["upload_url"], f, on_progress=on_progress)
+
+        # 3️⃣ Cloud Run sube de GCS a YouTube
+        self._update(job_id, status=UPLOADING_YOUTUBE, progress=1.0, message="Subiendo de GCS a YouTube…")
+        yt_resp = http_request(
+            "POST", f"{self.cloud_run_url}/upload_from_gcs/{alias}",
+            json=dict(metadata, gcs_path=upload_info["gcs_path"]), timeout=YOUTUBE_UPLOAD_TIMEOUT,
+            metric=("cloud_run", "upload_from_gcs")
+        )
+        if yt_resp.status_code != 200:
+            raise UploadError(f"Error al subir a YouTube ({yt_resp.status_code}): {yt_resp.text}")
+        result = yt_resp.json()
+        self._update(job_id, status=DONE, message="", url=result["url"], video_id=result["videoId"])
+        os.remove(self._file_path(job_id))
@@ -0,0 +1,20 @@
+import streamlit as st
+
+# Etiqueta de la vista -> módulo que la renderiza (se importa solo al abrirla)
+VIEWS = {
+    "Tendencias": "views.trending",
+    "Buscar": "views.search",
+    "Explorar Canal": "views.channel",
+    "Nicho": "views.niche",
+    "Ideas de Nicho": "views.ideas",
+    "Popularidad": "views.popularity",
+    "Historial": "views.history",
+    "Subir Vídeo": "views.upload",
+}
+
+
+def analizar_en_nicho(palabra):
+    # Callback: se ejecuta antes del rerun, así que puede cambiar la vista activa
+    st.session_state["nicho_kw"] = palabra
+    st.session_state["active_tab"] = "Nicho"
+    st.session_state["auto_search"] = True
@@ -0,0 +1,89 @@
+import pandas as pd
+import streamlit as st
+
+from channel_crawl import ChannelStore, CrawlError, channel_metrics, crawl_channel, estimate_quota, resolve_channel
+from normalize import format_duration
+from services import get_yt_client
+
+
+@st.cache_data(ttl=3600)
+def load_videos(channel_id, last_crawl):
+    # `last_crawl` forma parte de la clave: un rastreo nuevo invalida la copia en memoria
+    return ChannelStore(channel_id).load()
+
+
+def render():
+    yt = get_yt_client()
+    st.markdown("Explora todos los vídeos de un canal a partir de su lista de subidas "
+                "(2 unidades de cuota por cada 50 vídeos, frente a 100 por página de search).")
+    query = st.text_input("Canal (ID, @handle o URL):", key="canal_query")
+    if not query:
+        return
+    try:
+        channel = resolve_channel(yt, query)
+    except CrawlError as e:
+        st.error(str(e))
+        return
+    if channel is None:
+        st.warning("No se encontró el canal.")
+        return
+
+    store = ChannelStore(channel["id"])
+    state = store.state()
+    total = int(channel["statistics"].get("videoCount", 0))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Suscriptores", f"{int(channel['statistics'].get('subscriberCount', 0)):,}")
+    col2.metric("Vídeos publicados", f"{total:,}")
+    col3.metric("Último rastreo", state.get("last_crawl", "nunca")[:16].replace("T", " "))
+    st.subheader(channel["snippet"]["title"])
+
+    pending = total if not state else max(total - len(load_videos(channel["id"], state.get("last_crawl"))), 0)
+    col1, col2 = st.columns(2)
+    update = col1.button(f"Actualizar (~{estimate_quota(pending)} unidades)")
+    full = col2.button(f"Volver a descargar todo (~{estimate_quota(total)} unidades)",
+                       help="Refresca también las estadísticas de los vídeos antiguos")
+    if update or full:
+        progress = st.progress(0.0)
+        try:
+            for stored in crawl_channel(yt, channel, store, full=full):
+                progress.progress(min(stored / max(pending if update else total, 1), 1.0),
+                                  text=f"{stored} vídeos descargados…")
+        except CrawlError as e:
+            # Nada de este rastreo se ha guardado: se puede repetir sin perder vídeos
+            st.error(f"Rastreo interrumpido: {e}")
+            return
+        # De nuevo desde arriba, con el estado y los recuentos del rastreo recién hecho
+        st.rerun()
+
+    videos = load_videos(channel["id"], state.get("last_crawl"))
+    if videos.empty:
+        st.info("Pulsa Actualizar para descargar los vídeos del canal.")
+        return
+
+    m = channel_metrics(videos)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Vídeos guardados", len(videos))
+    gap = m["median_gap_days"]
+    col2.metric("Días entre subidas (mediana)", f"{gap:.1f}" if gap is not None else "—")
+    col3.metric("Subidas últimos 30 / 90 días", f"{m['last_30d']} / {m['last_90d']}")
+
+    st.subheader("Ritmo de subida (vídeos por semana, último año)")
+    st.bar_chart(m["weekly"].rename("Vídeos"))
+
+    st.subheader("Distribución de vistas por día")
+    st.bar_chart(m["views_per_day_hist"].rename("Vídeos"))
+
+    st.subheader("Mejores vídeos (vistas por día desde su publicación)")
+    top = m["top"]
+    st.dataframe(pd.DataFrame({
+        "Título": top["title"],
+        "Publicado": top["published_at"].dt.strftime("%Y-%m-%d"),
+        "Vistas": top["views"],
+        "Vistas/día": top["views_per_day"],
+        "Likes": top["likes"],
+        "Duración": format_duration(top["duration_s"]),
+        "Enlace": "https://youtu.be/" + top["video_id"],
+    }), hide_index=True)
+    st.download_button(
+        "Descargar CSV", m["videos"].to_csv(index=False), f"canal_{channel['id']}.csv", "text/csv"
+    )
@@ -0,0 +1,51 @@
+import pandas as pd
+import streamlit as st
+
+import singleflight
+import telemetry
+from config import QUOTA_BUDGET
+from services import get_yt_client, start_metrics_endpoint
+
+
+def stats_frame(stats):
+    df = pd.DataFrame(stats.rows())
+    if df.empty:
+        return df
+    calls = df["calls"].where(df["calls"] > 0)
+    return pd.DataFrame({
+        "Servicio": df["service"],
+        "Endpoint": df["endpoint"],
+        "Llamadas": df["calls"],
+        "Errores": df["errors"],
+        "Caché (aciertos/fallos)": df["cache_hits"].astype(str) + "/" + df["cache_misses"].astype(str),
+        "Latencia media (ms)": (df["latency_total"] / calls * 1000).round(0),
+        "Latencia máx. (ms)": (df["latency_max"] * 1000).round(0),
+        "KB": (df["bytes"] / 1024).round(1),
+        "Cuota": df["quota"],
+    })
+
+
+def render_sidebar():
+    start_metrics_endpoint()
+    session = st.session_state["telemetry"]
+    with st.sidebar.expander("🩺 Diagnóstico"):
+        used = telemetry.QUOTA_TODAY.used()
+        st.metric("Cuota usada hoy (proceso)", f"{used} / {QUOTA_BUDGET}")
+        st.progress(min(used / QUOTA_BUDGET, 1.0) if QUOTA_BUDGET else 1.0)
+        st.caption(f"Esta sesión: {session.quota_used()} unidades. El día de cuota empieza a medianoche "
+                   "(hora del Pacífico); las tablas cuentan desde el arranque del proceso.")
+
+        st.markdown("**Esta sesión**")
+        st.dataframe(stats_frame(session), hide_index=True)
+        st.markdown("**Proceso**")
+        st.dataframe(stats_frame(telemetry.PROCESS), hide_index=True)
+
+        cache = get_yt_client().cache
+        if cache is not None:
+            c = cache.stats()
+            st.caption(f"Caché en disco: {c['entries']} respuestas · {c['hits']} aciertos · {c['misses']} fallos")
+        sf = singleflight.stats()
+        st.caption(f"Peticiones agrupadas: {sf['coalesced']} · ejecutadas: {sf['executed']} · en curso: {sf['in_flight']}")
+
+        st.download_button("⬇️ Métricas (Prometheus)", telemetry.prometheus_text(), "metrics.txt", "text/plain")
+        st.download_button("⬇️ Llamadas de la sesión (JSONL)", session.jsonl(), "llamadas.jsonl", "application/jsonl")
@@ -0,0 +1,49 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from config import COUNTRIES
+from snapshots import SNAPSHOT_DIR, load_history, trending_metrics
+
+
+@st.cache_data(ttl=300)
+def cached_history(regions, start, end):
+    return load_history(SNAPSHOT_DIR, regions=regions, start=start, end=end)
+
+
+def render():
+    st.markdown("Evolución de las tendencias a partir de los snapshots guardados (sin gastar cuota de la API).")
+    countries = st.multiselect("Países:", list(COUNTRIES.keys()), default=list(COUNTRIES.keys())[:1])
+    today = datetime.date.today()
+    date_range = st.date_input("Rango de fechas:", (today - datetime.timedelta(days=28), today))
+    if not countries or len(date_range) != 2:
+        st.info("Elige al menos un país y un rango de fechas.")
+        return
+
+    history = cached_history(tuple(COUNTRIES[c] for c in countries), date_range[0], date_range[1])
+    if history.empty:
+        st.warning("No hay snapshots en ese rango. Lanza `python snapshots.py` para empezar a guardarlos.")
+        return
+
+    metrics = trending_metrics(history)
+    st.caption(f"{history['snapshot_ts'].nunique()} snapshots · {len(metrics)} vídeos")
+    df_metrics = metrics.rename(columns={
+        "region": "País", "title": "Título", "channel": "Canal", "hours_trending": "Horas en tendencias",
+        "snapshots": "Snapshots", "best_rank": "Mejor posición", "last_rank": "Última posición",
+        "rank_change": "Cambio de posición", "views_per_hour": "Vistas/hora", "likes_per_hour": "Likes/hora",
+    })[["País", "Título", "Canal", "Horas en tendencias", "Snapshots", "Mejor posición", "Última posición",
+        "Cambio de posición", "Vistas/hora", "Likes/hora"]].sort_values("Vistas/hora", ascending=False)
+    st.dataframe(df_metrics)
+    st.download_button("Descargar CSV", df_metrics.to_csv(index=False), "trending_historial.csv", "text/csv")
+
+    st.subheader("Movimiento en el ranking")
+    top_ids = metrics.sort_values("hours_trending", ascending=False)["video_id"].drop_duplicates().head(50)
+    titles = metrics.drop_duplicates("video_id").set_index("video_id")["title"]
+    selected = st.multiselect(
+        "Vídeos:", list(top_ids), default=list(top_ids[:3]), format_func=lambda vid: titles.get(vid, vid)
+    )
+    if selected:
+        sub = history[history["video_id"].isin(selected)]
+        ranks = pd.pivot_table(sub, index="snapshot_ts", columns="video_id", values="rank", aggfunc="min")
+        st.line_chart(ranks.rename(columns=titles.to_dict()))
@@ -0,0 +1,76 @@
+import threading
+from collections import Counter
+
+import pandas as pd
+import streamlit as st
+
+from analysis import KeywordCounts
+from config import COUNTRIES
+from normalize import category_index
+from prefetch import category_items, chart_items
+from services import get_yt_client
+from snapshots import snapshot_files
+from views import analizar_en_nicho
+
+
+@st.cache_resource
+def _baselines():
+    # Un recuento por región compartido entre sesiones, con los snapshots ya incorporados
+    return {"lock": threading.Lock(), "regions": {}}
+
+
+def baseline_counts(region):
+    """Recuento de los títulos del histórico de la región; solo se leen los snapshots nuevos."""
+    store = _baselines()
+    with store["lock"]:
+        entry = store["regions"].setdefault(region, {"counts": KeywordCounts.for_region(region), "files": set()})
+        for path in snapshot_files(region):
+            if path not in entry["files"]:
+                entry["counts"].add_titles(pd.read_parquet(path, columns=["title"])["title"])
+                entry["files"].add(path)
+        # Copia: otra sesión puede seguir actualizando el recuento compartido
+        return KeywordCounts.for_region(region).update(entry["counts"])
+
+
+def analizar_buttons(terms, key_prefix):
+    for term, freq in terms:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"{term} ({freq})")
+        with col2:
+            st.button("Analizar", key=f"{key_prefix}_{term}", on_click=analizar_en_nicho, args=(term,))
+
+
+def render():
+    yt = get_yt_client()
+    st.markdown("Genera ideas de nichos a partir de tendencias en YouTube sin introducir palabras clave.")
+    country_ideas = st.selectbox("🌍 País:", list(COUNTRIES.keys()))
+    max_videos_ideas = st.slider("Max vídeos a analizar:", 10, 50, 30)
+
+    if st.button("Generar ideas"):
+        region = COUNTRIES[country_ideas]
+        items = chart_items(yt, region)[:max_videos_ideas]
+        categorias = [item["snippet"]["categoryId"] for item in items]
+        words = KeywordCounts.for_region(region).add_titles(item["snippet"]["title"] for item in items)
+        st.subheader("Palabras más frecuentes en títulos de tendencias")
+        analizar_buttons(words.most_common(20), "analizar")
+        phrases = words.most_common(10, sizes=(2, 3))
+        if phrases:
+            st.subheader("Frases más repetidas")
+            analizar_buttons(phrases, "frase")
+
+        baseline = baseline_counts(region)
+        if baseline.docs:
+            rising = words.rising(baseline, 15)
+            st.subheader("En alza frente al histórico")
+            st.caption(f"Comparado con {baseline.docs} títulos de los snapshots guardados de {country_ideas}.")
+            st.dataframe(pd.DataFrame(
+                rising, columns=["Término", "Títulos ahora", "Títulos en el histórico", "Puntuación"]
+            ), hide_index=True)
+        else:
+            st.caption("Guarda snapshots con `python snapshots.py` para ver qué términos están en alza.")
+        cat_map = category_index(category_items(yt, region))
+        cat_count = Counter([cat_map.get(cid, "Desconocida") for cid in categorias])
+        df_cats = pd.DataFrame(cat_count.items(), columns=["Categoría", "Frecuencia"])
+        st.subheader("Categorías más frecuentes en tendencias")
+        st.dataframe(df_cats)
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+import telemetry
+from config import QUOTA_BUDGET
+from niche_engine import estimate_quota, iter_scan
+from niche_pipeline import ScanCancelled, ScanError
+from niche_score import DEFAULT_WEIGHTS
+from services import get_yt_client
+
+# Repintar la tabla en cada lote es caro con miles de canales: como mucho cada medio segundo
+REPAINT_INTERVAL = 0.5
+# Filas de la tabla (las de mejor puntuación); el CSV lleva todas
+TABLE_ROWS = 500
+
+WEIGHT_LABELS = {
+    "ratio": "Vistas por suscriptor", "views_per_video": "Vistas por vídeo", "growth": "Suscriptores por día",
+    "recency": "Actividad reciente", "faceless": "Faceless probable", "niche": "Coincidencia con la búsqueda",
+}
+
+
+def render():
+    yt = get_yt_client()
+    st.markdown("Analiza canales pequeños para encontrar oportunidades de nicho.")
+
+    default_kw = st.session_state.get("nicho_kw", "")
+    kw_niche = st.text_input("Palabra clave o categoría:", value=default_kw)
+    max_subs = st.number_input("Máx. suscriptores:", min_value=0, value=50000)
+    max_views = st.number_input("Máx. vistas totales:", min_value=0, value=5000000)
+    months_old = st.slider("Máx. antigüedad de vídeos (meses):", 1, 6, 2)
+    max_results_niche = st.slider("Máx. vídeos a analizar:", 10, 2000, 100, step=10)
+    with st.expander("Ponderación de la puntuación"):
+        weights = {name: st.slider(WEIGHT_LABELS[name], 0.0, 1.0, value, step=0.05, key=f"peso_{name}")
+                   for name, value in DEFAULT_WEIGHTS.items()}
+
+    # Estimación previa: las respuestas en caché no gastan cuota, así que es un máximo
+    estimate = estimate_quota(max_results_niche)
+    remaining = QUOTA_BUDGET - telemetry.QUOTA_TODAY.used()
+    st.caption(f"Coste máximo estimado: {estimate} unidades de cuota (quedan {remaining} de {QUOTA_BUDGET}).")
+    over_budget = estimate > remaining
+    if over_budget:
+        st.warning("Este escaneo podría superar el presupuesto de cuota configurado (YOUTUBE_QUOTA_BUDGET).")
+        over_budget = not st.checkbox("Buscar igualmente")
+
+    if st.button("Buscar nichos") or (default_kw and st.session_state.get("auto_search", False)):
+        st.session_state["auto_search"] = False
+        if not kw_niche:
+            st.warning("Introduce una palabra clave para iniciar la búsqueda.")
+        elif over_budget:
+            st.error("Búsqueda cancelada: reduce los vídeos a analizar o confirma que quieres continuar.")
+        else:
+            # Cancelar el escaneo anterior de esta sesión si la palabra clave ha cambiado
+            prev_scan = st.session_state.get("nicho_scan")
+            if prev_scan and prev_scan["kw"] != kw_niche:
+                prev_scan["cancel"].set()
+            cancel_event = threading.Event()
+            st.session_state["nicho_scan"] = {"kw": kw_niche, "cancel": cancel_event}
+
+            # Streaming: tabla y gráfico se repintan a medida que llegan páginas y lotes de canales
+            status = st.empty()
+            progress = st.progress(0.0)
+            table = st.empty()
+            chart = st.empty()
+            agg, last_paint = None, 0.0
+            try:
+                for agg in iter_scan(
+                    yt, kw_niche, max_subs=max_subs, max_views=max_views, months_old=months_old,
+                    max_results=max_results_niche, cancel_event=cancel_event, weights=weights
+                ):
+                    if time.monotonic() - last_paint >= REPAINT_INTERVAL:
+                        paint(agg, status, progress, table, chart, max_results_niche)
+                        last_paint = time.monotonic()
+            except ScanCancelled:
+                st.stop()
+            except ScanError as e:
+                progress.empty()
+                st.error(f"Escaneo interrumpido: {e}")
+                return
+            progress.empty()
+            paint(agg, status, progress, table, chart, max_results_niche, final=True)
+
+
+def channels_table(agg):
+    channels = agg.frame()
+    return channels.assign(faceless=channels["faceless"].map({True: "Sí", False: "No"})).rename(
+        columns={
+            "channel": "Canal", "score": "Puntuación", "subscribers": "Suscriptores", "views_total": "Vistas totales",
+            "video_count": "Vídeos", "ratio": "Ratio vistas/suscriptor", "views_per_video": "Vistas/vídeo",
+            "subs_per_day": "Suscriptores/día", "days_since_upload": "Días desde el último vídeo",
+            "faceless": "Faceless probable", "niche": "Coincidencia", "link": "Enlace",
+        }
+    ).drop(columns="channel_id")
+
+
+def paint(agg, status, progress, table, chart, max_results, final=False):
+    df_channels = channels_table(agg)
+    if final:
+        status.subheader(f"Resultados: {len(df_channels)} canales encontrados")
+    else:
+        status.caption(f"Analizando… {agg.videos} vídeos · {agg.channels_checked} canales revisados · "
+                       f"{len(df_channels)} cumplen los filtros")
+        progress.progress(min(agg.videos / max_results, 1.0))
+    if df_channels.empty:
+        if final:
+            table.info("No se encontraron canales que cumplan con los filtros.")
+        return
+    with table.container():
+        st.dataframe(df_channels.head(TABLE_ROWS), hide_index=True)
+        if final:
+            st.download_button("⬇️ Descargar CSV", df_channels.to_csv(index=False), "nicho_canales.csv", "text/csv")
+    df_words = pd.DataFrame(agg.words.most_common(15), columns=["Palabra", "Frecuencia"])
+    df_phrases = pd.DataFrame(agg.words.most_common(10, sizes=(2, 3)), columns=["Frase", "Frecuencia"])
+    with chart.container():
+        st.subheader("Palabras clave más usadas en títulos")
+        st.bar_chart(df_words.set_index("Palabra"))
+        if not df_phrases.empty:
+            st.subheader("Frases más repetidas")
+            st.bar_chart(df_phrases.set_index("Frase"))
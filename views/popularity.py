@@ -0,0 +1,117 @@
+import streamlit as st
+
+from services import get_trends_service
+from trends import MAX_KEYWORDS
+from views import analizar_en_nicho
+
+
+def render():
+    st.markdown("Analiza la popularidad de una palabra clave en YouTube y descubre consultas relacionadas.")
+
+    kw_trend = st.text_input("Palabra clave para analizar:")
+    timeframes = {
+        "Última hora": "now 1-H",
+        "Últimas 4 horas": "now 4-H",
+        "Último día": "now 1-d",
+        "Últimos 7 días": "now 7-d",
+        "Últimos 30 días": "today 1-m",
+        "Últimos 90 días": "today 3-m",
+        "Últimos 12 meses": "today 12-m",
+        "Últimos 5 años": "today+5-y",
+        "Desde 2008": "all"
+    }
+    period = st.selectbox("Periodo de análisis:", list(timeframes.keys()))
+
+    if st.button("Analizar tendencia"):
+        if not kw_trend:
+            st.warning("Introduce una palabra clave.")
+        else:
+            with st.spinner("Consultando Google Trends…"):
+                df_trend, related = get_trends_service().fetch_trends(kw_trend, timeframes[period])
+            # Se guarda el resultado: los reruns (cambiar el periodo, la comparación) no llaman a Google
+            st.session_state["trend_result"] = (kw_trend, timeframes[period], df_trend, related)
+            st.session_state.pop("trend_compare_result", None)
+
+    if "trend_result" in st.session_state:
+        kw_trend, timeframe, df_trend, related = st.session_state["trend_result"]
+        if df_trend is None:
+            st.error("Google Trends está limitando el acceso temporalmente. Intenta más tarde.")
+
+        # Gráfico de interés
+        if df_trend is not None and not df_trend.empty:
+            df_trend = df_trend.drop(columns=["isPartial"], errors="ignore")
+            st.line_chart(df_trend)
+
+            avg_interest = df_trend[kw_trend].mean()
+            last_value = df_trend[kw_trend].iloc[-1]
+            st.write(f"📊 **Interés medio:** {avg_interest:.2f}")
+            st.write(f"📈 **Último valor:** {last_value}")
+
+            if last_value > avg_interest:
+                st.success("Tendencia al alza 📈")
+            elif last_value < avg_interest:
+                st.error("Tendencia a la baja 📉")
+            else:
+                st.info("Tendencia estable ➡️")
+        elif df_trend is not None:
+            st.warning("No se encontraron datos para esa palabra clave en YouTube.")
+
+        # Consultas relacionadas
+        if kw_trend in related:
+            st.subheader("🔍 Consultas relacionadas")
+
+            col1, col2 = st.columns(2)
+            rel_data = related[kw_trend]
+
+            with col1:
+                st.markdown("**Top**")
+                if rel_data.get("top") is not None:
+                    for _, row in rel_data["top"].iterrows():
+                        palabra = row["query"]
+                        st.write(f"{palabra} ({row['value']})")
+                        st.button("Analizar", key=f"top_{palabra}", on_click=analizar_en_nicho, args=(palabra,))
+                else:
+                    st.write("Sin datos.")
+
+            with col2:
+                st.markdown("**Rising**")
+                if rel_data.get("rising") is not None:
+                    for _, row in rel_data["rising"].iterrows():
+                        palabra = row["query"]
+                        change = f"+{row['value']}%" if row['value'] != 0 else "Nuevo"
+                        st.write(f"{palabra} ({change})")
+                        st.button("Analizar", key=f"rise_{palabra}", on_click=analizar_en_nicho, args=(palabra,))
+                else:
+                    st.write("Sin datos.")
+
+            compare_related(kw_trend, timeframe, rel_data)
+
+
+def compare_related(kw_trend, timeframe, rel_data):
+    """Interés de la palabra clave frente a hasta 4 consultas relacionadas, en un solo payload."""
+    candidates = list(dict.fromkeys(
+        query for kind in ("top", "rising") if rel_data.get(kind) is not None for query in rel_data[kind]["query"]
+    ))
+    if not candidates:
+        return
+    st.subheader("📊 Comparar con consultas relacionadas")
+    chosen = st.multiselect("Consultas a comparar:", candidates, max_selections=MAX_KEYWORDS - 1, key="trend_compare")
+    if st.button("Comparar", disabled=not chosen):
+        trends = get_trends_service()
+        with st.spinner("Consultando Google Trends…"):
+            st.session_state["trend_compare_result"] = (
+                chosen, trends.interest_over_time([kw_trend] + chosen, timeframe), trends.related_queries(chosen, timeframe)
+            )
+    if "trend_compare_result" not in st.session_state:
+        return
+    chosen, df_cmp, related = st.session_state["trend_compare_result"]
+    if df_cmp is None:
+        st.error("Google Trends está limitando el acceso temporalmente. Intenta más tarde.")
+    elif not df_cmp.empty:
+        df_cmp = df_cmp.drop(columns=["isPartial"], errors="ignore")
+        st.line_chart(df_cmp)
+        st.dataframe(df_cmp.mean().round(2).rename("Interés medio").to_frame())
+    for kw in chosen:
+        rising = related.get(kw, {}).get("rising")
+        if rising is not None and not rising.empty:
+            st.caption(f"**{kw}** — al alza: " + ", ".join(rising["query"].head(5)))
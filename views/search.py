@@ -0,0 +1,43 @@
+import streamlit as st
+
+from config import COUNTRIES
+from normalize import format_duration, videos_frame
+from services import get_yt_client
+
+
+def render():
+    yt = get_yt_client()
+    st.markdown("Buscar global o por país, con visitas, likes, duración.")
+    query = st.text_input("Palabra clave:")
+    country_opt = st.selectbox("País (opcional):", [""] + list(COUNTRIES.keys()))
+    maxr2 = st.slider("Max resultados:", 5, 50, 20)
+    order_opt = st.selectbox("Ordenar por:", ["relevance", "date", "viewCount", "rating", "title"])
+
+    if st.button("Buscar"):
+        sr = yt.get(
+            "search", part="snippet", type="video", maxResults=maxr2, q=query, order=order_opt,
+            regionCode=COUNTRIES[country_opt] if country_opt else None,
+            fields="items(id/videoId,snippet(title,channelTitle,channelId,publishedAt))"
+        )
+        found = videos_frame(sr.get("items", []))
+        if not found.empty:
+            stats = videos_frame(yt.get(
+                "videos", part="statistics,contentDetails", id=",".join(found["video_id"]),
+                fields="items(id,statistics(viewCount,likeCount),contentDetails/duration)"
+            ).get("items", []))
+            found = found[["video_id", "title", "channel_title", "channel_id", "published_at"]].merge(
+                stats.reindex(columns=["video_id", "views", "likes", "duration_s"]), on="video_id", how="left"
+            )
+            df2 = found.assign(
+                published=found["published_at"].dt.strftime("%Y-%m-%d"),
+                duration=format_duration(found["duration_s"]),
+                link="https://youtu.be/" + found["video_id"],
+            ).rename(columns={
+                "title": "Título", "channel_title": "Canal", "published": "Publicado", "views": "Vistas",
+                "likes": "Likes", "duration": "Duración", "duration_s": "Duración (s)", "link": "Enlace",
+                "channel_id": "Channel ID",
+            })[["Título", "Canal", "Publicado", "Vistas", "Likes", "Duración", "Duración (s)", "Enlace", "Channel ID"]]
+            st.dataframe(df2)
+            st.download_button("Descargar CSV", df2.to_csv(index=False), "search.csv", "text/csv")
+        else:
+            st.warning("Sin resultados.")
@@ -0,0 +1,45 @@
+import datetime
+
+import streamlit as st
+
+from config import COUNTRIES
+from normalize import category_index, format_duration, videos_frame, with_categories
+from prefetch import category_items, chart_items
+from services import get_yt_client
+
+
+def render():
+    yt = get_yt_client()
+    st.markdown("Videos en tendencia por país, categoría y palabra clave.")
+    country = st.selectbox("País (tendencias):", list(COUNTRIES.keys()))
+    maxr = st.slider("Max videos:", 5, 50, 20)
+    kw = st.text_input("Filtrar título (opcional):")
+
+    cat_names = category_index(category_items(yt, COUNTRIES[country]))  # id -> título
+    categories = {"Todas": None, **{title: cid for cid, title in cat_names.items()}}
+    cat_sel = st.selectbox("Categoría (opcional):", list(categories.keys()))
+
+    if st.button("Obtener tendencias"):
+        # Siempre el chart completo (precargado y compartido con Ideas de Nicho); se recorta aquí
+        videos = videos_frame(chart_items(yt, COUNTRIES[country])[:maxr])
+        if not videos.empty:
+            mask = videos["title"].str.contains(kw, case=False, regex=False) if kw else videos["title"].notna()
+            if categories[cat_sel] is not None:
+                mask = mask & (videos["category_id"] == categories[cat_sel])
+            videos = with_categories(videos[mask].copy(), cat_names)
+        if not videos.empty:
+            df = videos.assign(
+                duration=format_duration(videos["duration_s"]),
+                published=videos["published_at"].dt.strftime("%Y-%m-%d"),
+                fecha=datetime.datetime.now().strftime("%Y-%m-%d"),
+                link="https://youtu.be/" + videos["video_id"],
+            ).rename(columns={
+                "title": "Título", "channel_title": "Canal", "views": "Vistas", "likes": "Likes",
+                "duration": "Duración", "duration_s": "Duración (s)", "category": "Categoría",
+                "published": "Publicado", "fecha": "Fecha", "link": "Enlace", "channel_id": "Channel ID",
+            })[["Título", "Canal", "Vistas", "Likes", "Duración", "Duración (s)", "Categoría",
+                "Publicado", "Fecha", "Enlace", "Channel ID"]]
+            st.dataframe(df)
+            st.download_button("Descargar CSV", df.to_csv(index=False), "trending.csv", "text/csv")
+        else:
+            st.warning("No hay videos con esos filtros.")
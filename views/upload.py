@@ -0,0 +1,153 @@
+import streamlit as st
+
+from config import CLOUD_RUN_URL
+from services import fetch_channels, get_upload_jobs
+from upload_jobs import DONE, ERROR, STATUS_LABELS, UPLOADING_GCS
+
+
+def render():
+    st.markdown("⬆️ **Subir un vídeo a YouTube** (a través del servicio en Cloud Run)")
+
+    # 🔑 Autorizar un nuevo canal
+    st.subheader("🔑 Autorizar un nuevo canal")
+    alias = st.text_input("Alias para el canal (ej: canal_monetizado)", key="auth_alias")
+    if st.button("Generar enlace de autorización", key="btn_auth"):
+        if alias.strip():
+            auth_url = f"{CLOUD_RUN_URL}/authorize/{alias.strip()}"
+            redirect_uri = f"{CLOUD_RUN_URL}/oauth2callback/{alias.strip()}"
+            st.success(f"Enlace de autorización generado para '{alias}':")
+            st.markdown(f"[Haz clic aquí para autorizar el canal]({auth_url})")
+            st.warning("""
+            ⚠️ **IMPORTANTE**  
+            1. Añade el Gmail en **Usuarios de prueba** (Pantalla de consentimiento OAuth).  
+            2. Añade este Redirect URI en tu Cliente OAuth en Google Cloud Console:
+            """)
+            st.code(redirect_uri, language="text")
+        else:
+            st.error("Debes escribir un alias para el canal.")
+
+    st.markdown("---")
+
+    # 🎥 Subir un vídeo
+    st.subheader("🎥 Subir un vídeo")
+
+    # 1) Obtener y fijar canal autorizado (cache + orden estable)
+    channels = fetch_channels()
+    if channels:
+        # Construir etiquetas estables y ordenadas
+        options_map = {f"{v.get('title', 'Desconocido')} ({k})": k for k, v in channels.items()}
+        labels = sorted(options_map.keys(), key=str.lower)
+
+        # Default desde session_state si existe
+        default_label = None
+        if "channel_name" in st.session_state:
+            for lbl, alias_ in options_map.items():
+                if alias_ == st.session_state["channel_name"]:
+                    default_label = lbl
+                    break
+        default_index = labels.index(default_label) if default_label in labels else 0
+
+        selected_label = st.selectbox(
+            "Selecciona un canal autorizado:",
+            labels,
+            index=default_index,
+            key="upload_selected_label"
+        )
+        channel_name = options_map[selected_label]
+        st.session_state["channel_name"] = channel_name
+    else:
+        st.warning("No hay canales autorizados todavía. Autoriza uno primero.")
+        channel_name = None
+
+    # 2) Formulario: evita reruns mientras rellenas
+    if channel_name:
+        # Categorías oficiales de YouTube
+        categories = {
+            "Film & Animation": "1",
+            "Autos & Vehicles": "2",
+            "Music": "10",
+            "Pets & Animals": "15",
+            "Sports": "17",
+            "Travel & Events": "19",
+            "Gaming": "20",
+            "Videoblogging": "21",
+            "People & Blogs": "22",
+            "Comedy": "23",
+            "Entertainment": "24",
+            "News & Politics": "25",
+            "Howto & Style": "26",
+            "Education": "27",
+            "Science & Technology": "28",
+            "Nonprofits & Activism": "29",
+        }
+
+        with st.form("upload_form", clear_on_submit=False):
+            title = st.text_input("Título del vídeo:", key="upload_title")
+            description = st.text_area("Descripción del vídeo:", key="upload_desc")
+            privacy = st.selectbox("Privacidad:", ["public", "unlisted", "private"], key="upload_privacy")
+            tags = st.text_input("Etiquetas (separadas por comas):", key="upload_tags")
+
+            category_name = st.selectbox(
+                "Categoría:",
+                list(categories.keys()),
+                index=list(categories.keys()).index("People & Blogs"),
+                key="upload_category"
+            )
+            category_id = categories[category_name]
+
+            video_file = st.file_uploader(
+                "Selecciona el archivo de vídeo (.mp4, .mov, .avi, .mkv)",
+                type=["mp4", "mov", "avi", "mkv"],
+                key="upload_file"
+            )
+
+            submitted = st.form_submit_button("🚀 Subir vídeo")
+
+        if submitted:
+            if not video_file:
+                st.error("Debes seleccionar un archivo de vídeo.")
+            else:
+                # La subida corre en segundo plano: el script no se bloquea y el trabajo
+                # sobrevive a reruns y reinicios. Se pueden encolar varios vídeos y canales.
+                job_id = get_upload_jobs().submit(channel_name, video_file, {
+                    "title": title,
+                    "description": description,
+                    "privacy": privacy,
+                    "tags": [t.strip() for t in tags.split(",") if t.strip()],
+                    "categoryId": category_id,
+                })
+                st.session_state.setdefault("upload_jobs", []).append(job_id)
+                st.success(f"Vídeo «{title}» añadido a la cola de subida.")
+
+    render_jobs(channel_name)
+
+
+@st.fragment(run_every=3)
+def render_jobs(alias):
+    """Estado de las subidas; se refresca solo, sin bloquear el resto de la página.
+
+    Se leen de la cola persistente las últimas del canal seleccionado (también tras
+    recargar la página o reiniciar el proceso), más las de otros canales encoladas en
+    esta sesión.
+    """
+    manager = get_upload_jobs()
+    jobs = {job["id"]: job for job in manager.get(st.session_state.get("upload_jobs", []))}
+    if alias:
+        jobs.update((job["id"], job) for job in manager.recent(alias))
+    if not jobs:
+        return
+    st.markdown("---")
+    st.subheader("📋 Subidas")
+    for job in sorted(jobs.values(), key=lambda job: job["created_at"]):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.write(f"**{job['title'] or '(sin título)'}** · {job['alias']} · {STATUS_LABELS[job['status']]}")
+            if job["status"] == UPLOADING_GCS:
+                st.progress(job["progress"], text=job["message"] or None)
+            elif job["status"] == DONE:
+                st.markdown(f"[Ver en YouTube]({job['url']}) · ID: `{job['video_id']}`")
+            elif job["message"]:
+                st.caption(job["message"])
+        with col2:
+            if job["status"] == ERROR:
+                st.button("Reintentar", key=f"retry_{job['id']}", on_click=manager.retry, args=(job["id"],))
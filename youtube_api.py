@@ -0,0 +1,144 @@
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import singleflight
+import telemetry
+from api_cache import make_key, ttl_for
+
+# Sobrescribible para apuntar a un servidor simulado (benchmarks)
+YT_BASE_URL = os.environ.get("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+
+# Timeouts (conexión, lectura) por endpoint
+TIMEOUTS = {
+    "videoCategories": (5, 10),
+    "videos": (5, 15),
+    "search": (5, 15),
+    "channels": (5, 15),
+    "playlistItems": (5, 15),
+    "cloud_run": (5, 30),
+}
+DEFAULT_TIMEOUT = (5, 30)
+
+# Razones de un 403 que sí merece reintento (el quotaExceeded diario no)
+RETRYABLE_403_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Sesión HTTP compartida por todo el proceso (keep-alive + pool de conexiones)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                # Google solo comprime si el User-Agent incluye "gzip"
+                s.headers.update({
+                    "Accept-Encoding": "gzip",
+                    "User-Agent": "youtube-trending-streamlit (gzip)",
+                })
+                _session = s
+    return _session
+
+
+def _is_retryable(resp):
+    if resp.status_code >= 500:
+        return True
+    if resp.status_code == 403:
+        try:
+            errors = resp.json().get("error", {}).get("errors", [])
+        except ValueError:
+            return False
+        return any(e.get("reason") in RETRYABLE_403_REASONS for e in errors)
+    return False
+
+
+def http_request(method, url, timeout=DEFAULT_TIMEOUT, max_retries=3, backoff=0.5, metric=None, **kwargs):
+    """Petición sobre la sesión compartida con reintentos acotados y backoff con jitter.
+
+    Solo se reintentan los GET: un POST/PUT repetido podría duplicar trabajo en el backend.
+    Con `metric=(servicio, endpoint)` cada intento queda registrado en `telemetry`.
+    """
+    retries = max_retries if method.upper() == "GET" else 0
+    for attempt in range(retries + 1):
+        start = time.perf_counter()
+        try:
+            resp = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if metric:
+                telemetry.record_call(*metric, time.perf_counter() - start)
+            if attempt >= retries:
+                raise
+        else:
+            if metric:
+                telemetry.record_call(*metric, time.perf_counter() - start, len(resp.content), resp.status_code)
+            if attempt >= retries or not _is_retryable(resp):
+                return resp
+        time.sleep(backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+class YouTubeClient:
+    """Cliente mínimo de la YouTube Data API v3 sobre la sesión compartida."""
+
+    def __init__(self, api_key, base_url=None, cache=None, budget=None):
+        self.api_key = api_key
+        self.base_url = (base_url or YT_BASE_URL).rstrip("/")
+        self.cache = cache
+        self.budget = budget  # QuotaBudget opcional: solo descuentan las llamadas reales
+
+    def get(self, endpoint, fields=None, **params):
+        """GET a `endpoint` devolviendo el JSON (incluido el cuerpo de error, si lo hay).
+
+        `fields` limita la respuesta a las claves que realmente se usan. Las respuestas
+        correctas se guardan en `cache` (si hay) con el TTL de su endpoint, y las
+        peticiones idénticas simultáneas (de cualquier sesión) comparten una sola llamada.
+        """
+        params, key = self._request_key(endpoint, fields, params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            telemetry.record_cache("youtube", endpoint, cached is not None)
+            if cached is not None:
+                return cached
+        return singleflight.do(("youtube", self.base_url, key), self._fetch_and_store, endpoint, params, key)
+
+    def refresh(self, endpoint, fields=None, **params):
+        """Como `get`, pero siempre pide a la API y renueva la entrada de la caché (precarga)."""
+        params, key = self._request_key(endpoint, fields, params)
+        return singleflight.do(("youtube", self.base_url, key), self._fetch_and_store, endpoint, params, key)
+
+    def _request_key(self, endpoint, fields, params):
+        params = {k: v for k, v in params.items() if v is not None}
+        if fields:
+            params["fields"] = fields
+        return params, make_key(endpoint, params, self.base_url)
+
+    def _fetch_and_store(self, endpoint, params, key):
+        data = self._fetch(endpoint, params)
+        if self.cache is not None and "error" not in data:
+            self.cache.set(key, data, ttl_for(endpoint, params))
+        return data
+
+    def _fetch(self, endpoint, params):
+        if self.budget is not None:
+            self.budget.charge(endpoint)
+        params = dict(params, key=self.api_key)
+        resp = http_request(
+            "GET",
+            f"{self.base_url}/{endpoint}",
+            params=params,
+            timeout=TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT),
+            metric=("youtube", endpoint),
+        )
+        try:
+            return resp.json()
+        except ValueError:
+            return {"error": {"code": resp.status_code, "message": resp.text}}